@@ -1,13 +1,19 @@
 from .kmp import KMPSearch
 from .bm import BoyerMooreSearch
 from .aho_corasick import AhoCorasickSearch
+from .wu_manber import WuManberSearch
 from .levenshtein import LevenshteinDistance
+from .bitap import BitapSearch
 from .encryption import DataEncryption
+from .blind_index import BlindIndex
 
 __all__ = [
     'KMPSearch',
     'BoyerMooreSearch', 
     'AhoCorasickSearch',
+    'WuManberSearch',
     'LevenshteinDistance',
-    'DataEncryption'
+    'BitapSearch',
+    'DataEncryption',
+    'BlindIndex'
 ]
\ No newline at end of file
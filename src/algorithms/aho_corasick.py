@@ -1,5 +1,9 @@
-from typing import List, Dict, Set
-from collections import deque, defaultdict
+from typing import List, Dict, Set, Tuple, Iterable, Iterator, Sequence, Optional, Union
+from collections import deque, defaultdict, OrderedDict
+from array import array
+from bisect import bisect_right
+
+from .text_normalizer import NormalizedText, normalize_query
 
 class TrieNode:
     def __init__(self):
@@ -8,50 +12,93 @@ class TrieNode:
         self.output = []
         self.is_end = False
 
-class AhoCorasickSearch:
-    def __init__(self):
-        self.root = TrieNode()
-        self.patterns = []
-    
-    def add_pattern(self, pattern: str) -> None:
-        # Tambahkan satu pattern ke trie
-        if pattern not in self.patterns:
-            self.patterns.append(pattern)
-        node = self.root
-        for char in pattern:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
-        node.is_end = True
-        node.output.append(pattern)
-    
-    def build_failure_links(self) -> None:
-        # Bangun failure link 
-        queue = deque()
-        for child in self.root.children.values():
-            child.failure = self.root
+def _insert_pattern(root: TrieNode, pattern: str) -> None:
+    # Masukkan satu pattern ke trie mulai dari root
+    node = root
+    for char in pattern:
+        if char not in node.children:
+            node.children[char] = TrieNode()
+        node = node.children[char]
+    node.is_end = True
+    node.output.append(pattern)
+
+def _link_failures(root: TrieNode) -> None:
+    # Bangun failure link secara BFS
+    queue = deque()
+    for child in root.children.values():
+        child.failure = root
+        queue.append(child)
+    while queue:
+        current = queue.popleft()
+        for char, child in current.children.items():
             queue.append(child)
-        while queue:
-            current = queue.popleft()
-            for char, child in current.children.items():
-                queue.append(child)
-                failure = current.failure
-                while failure is not None and char not in failure.children:
-                    failure = failure.failure
-                child.failure = failure.children[char] if failure and char in failure.children else self.root
-                child.output.extend(child.failure.output)
-    
-    def search_multiple(self, text: str, patterns: List[str]) -> Dict[str, List[int]]:
-        # Cari semua pola, lalu kembalikan posisi kemunculannya
+            failure = current.failure
+            while failure is not None and char not in failure.children:
+                failure = failure.failure
+            child.failure = failure.children[char] if failure and char in failure.children else root
+            child.output.extend(child.failure.output)
+
+def normalize_patterns(patterns: Iterable[str]) -> Tuple[str, ...]:
+    # Buang pattern kosong dan duplikat, urutan tetap dipertahankan
+    seen = []
+    for pattern in patterns:
+        pattern = pattern.strip()
+        if pattern and pattern not in seen:
+            seen.append(pattern)
+    return tuple(seen)
+
+CORPUS_SEPARATOR = "\x00"
+
+def build_corpus(texts: Iterable[str], separator: str = CORPUS_SEPARATOR) -> Tuple[str, array]:
+    """
+    Gabungkan banyak dokumen menjadi satu buffer. offsets[i] adalah posisi awal
+    dokumen ke-i di buffer; separator mencegah match melewati batas dokumen.
+    """
+    offsets = array('q')
+    parts = []
+    position = 0
+    for text in texts:
+        offsets.append(position)
+        parts.append(text)
+        position += len(text) + len(separator)
+    return separator.join(parts), offsets
+
+def _count_matches(matches: Iterable[Tuple[str, int]], pattern_count: int, limit: Optional[int]) -> Dict[str, int]:
+    # Hitung kemunculan per pola tanpa membuat list posisi. Kalau limit diisi,
+    # hitungan tiap pola berhenti di limit dan scan selesai saat semua pola penuh
+    counts = defaultdict(int)
+    saturated = 0
+    for pattern, _ in matches:
+        if limit is None:
+            counts[pattern] += 1
+        elif counts[pattern] < limit:
+            counts[pattern] += 1
+            if counts[pattern] == limit:
+                saturated += 1
+                if saturated == pattern_count:
+                    break
+    return dict(counts)
+
+def _count_per_document(matches: Iterable[Tuple[str, int]], offsets: Sequence[int]) -> List[Dict[str, int]]:
+    # Petakan tiap match ke dokumennya dengan binary search di array offset
+    counts = [defaultdict(int) for _ in range(len(offsets))]
+    for pattern, start_pos in matches:
+        counts[bisect_right(offsets, start_pos) - 1][pattern] += 1
+    return [dict(doc_counts) for doc_counts in counts]
+
+class AhoCorasickMatcher:
+    # Automaton yang sudah dikompilasi, bisa dipakai ulang untuk banyak teks
+    def __init__(self, patterns: Tuple[str, ...]):
+        self.patterns = list(patterns)
         self.root = TrieNode()
-        self.patterns = []
-        for pattern in patterns:
-            if pattern.strip():
-                self.add_pattern(pattern.strip())
+        for pattern in self.patterns:
+            _insert_pattern(self.root, pattern)
+        _link_failures(self.root)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[str, int]]:
+        # Hasilkan pasangan (pattern, posisi awal) sesuai urutan posisi akhir
         if not self.patterns:
-            return {}
-        self.build_failure_links()
-        results = defaultdict(list)
+            return
         current = self.root
         for i, char in enumerate(text):
             while current is not None and char not in current.children:
@@ -61,31 +108,314 @@ class AhoCorasickSearch:
                 continue
             current = current.children[char]
             for pattern in current.output:
-                start_pos = i - len(pattern) + 1
-                results[pattern].append(start_pos)
+                yield pattern, i - len(pattern) + 1
+
+    def search(self, text: str) -> Dict[str, List[int]]:
+        # Cari semua pola, lalu kembalikan posisi kemunculannya
+        results = defaultdict(list)
+        for pattern, start_pos in self.iter_matches(text):
+            results[pattern].append(start_pos)
         return dict(results)
-    
+
+    def count(self, text: str, limit: Optional[int] = None) -> Dict[str, int]:
+        # Jumlah kemunculan tiap pola tanpa menyimpan posisi
+        return _count_matches(self.iter_matches(text), len(self.patterns), limit)
+
+    def contains(self, text: str) -> bool:
+        # True kalau salah satu pola muncul, berhenti di match pertama
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+    def scan_corpus(self, corpus: str, offsets: Sequence[int]) -> List[Dict[str, int]]:
+        # Satu kali pemindaian untuk seluruh korpus, hasil dihitung per dokumen
+        return _count_per_document(self.iter_matches(corpus), offsets)
+
+def _smallest_typecode(max_value: int) -> str:
+    # Pilih tipe array unsigned terkecil yang bisa menampung max_value
+    for typecode in ('B', 'H', 'I', 'L', 'Q'):
+        if max_value < 1 << (8 * array(typecode).itemsize):
+            return typecode
+    raise OverflowError("Automaton terlalu besar untuk tabel array")
+
+class _ClassTable(dict):
+    # Tabel str.translate: karakter alfabet -> kelasnya, karakter lain -> kelas 0.
+    # Karakter asing disimpan saat pertama muncul supaya lookup berikutnya di C.
+    def __init__(self, char_classes: Dict[str, int]):
+        super().__init__((ord(char), chr(cls)) for char, cls in char_classes.items())
+
+    def __missing__(self, key: int) -> str:
+        self[key] = "\x00"
+        return "\x00"
+
+class FlatAhoCorasickMatcher:
+    """
+    Automaton Aho-Corasick dalam bentuk DFA rata (flat) berbasis array.
+    Alfabet di-remap ke id kelas yang rapat (0 = karakter di luar pattern),
+    fungsi goto sudah dihitung penuh sehingga pemindaian tidak perlu
+    mengikuti failure link, dan output tiap node disimpan sebagai rentang
+    offset di satu array bersama.
+    """
+    def __init__(self, patterns: Tuple[str, ...]):
+        self.patterns = list(patterns)
+        self.pattern_lengths = array('i', (len(p) for p in self.patterns))
+        alphabet = sorted({char for pattern in self.patterns for char in pattern})
+        self.char_classes = {char: i + 1 for i, char in enumerate(alphabet)}
+        self.width = len(alphabet) + 1
+        self._class_table = _ClassTable(self.char_classes)
+        self._byte_table = None
+        if self.width <= 256:
+            table = bytearray(256)
+            for char, cls in self.char_classes.items():
+                if ord(char) < 128:
+                    table[ord(char)] = cls
+            self._byte_table = bytes(table)
+
+        # Trie sementara: daftar child per node dan id pattern yang berakhir di node
+        children = [{}]
+        own_output = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                cls = self.char_classes[char]
+                nxt = children[node].get(cls)
+                if nxt is None:
+                    nxt = len(children)
+                    children.append({})
+                    own_output.append([])
+                    children[node][cls] = nxt
+                node = nxt
+            own_output[node].append(pattern_id)
+
+        # BFS: hitung failure link, output gabungan, dan urutan node
+        node_count = len(children)
+        failure = [0] * node_count
+        outputs = [()] * node_count
+        order = [0]
+        queue = deque([0])
+        while queue:
+            node = queue.popleft()
+            for cls, child in children[node].items():
+                if node != 0:
+                    fail = failure[node]
+                    while fail and cls not in children[fail]:
+                        fail = failure[fail]
+                    failure[child] = children[fail].get(cls, 0)
+                outputs[child] = tuple(own_output[child]) + outputs[failure[child]]
+                order.append(child)
+                queue.append(child)
+
+        # Node yang punya output diberi id kecil [0, terminal_count) supaya
+        # pengecekan output cukup dengan satu perbandingan integer
+        terminal = [node for node in order if outputs[node]]
+        others = [node for node in order if not outputs[node]]
+        new_id = [0] * node_count
+        for i, node in enumerate(terminal + others):
+            new_id[node] = i
+        self.terminal_count = len(terminal)
+        self.start_state = new_id[0]
+
+        # Tabel goto lengkap. Isinya langsung offset baris (state * width)
+        # sehingga transisi cukup delta[state + cls] tanpa perkalian
+        width = self.width
+        typecode = _smallest_typecode(node_count * width)
+        delta = array(typecode, bytes(array(typecode).itemsize * node_count * width))
+        for node in order:
+            base = new_id[node] * width
+            fail_base = new_id[failure[node]] * width
+            for cls in range(width):
+                child = children[node].get(cls)
+                if child is not None:
+                    delta[base + cls] = new_id[child] * width
+                elif node == 0:
+                    delta[base + cls] = self.start_state * width
+                else:
+                    delta[base + cls] = delta[fail_base + cls]
+        self.delta = delta
+        self.start_state *= width
+        self.terminal_limit = self.terminal_count * width
+
+        # Output dibagi bersama: node dengan himpunan output sama memakai offset yang sama
+        self.output_start = array('i', [0] * (self.terminal_count + 1))
+        self.output_end = array('i', [0] * (self.terminal_count + 1))
+        self.output_ids = array('i')
+        shared = {}
+        for node in terminal:
+            key = outputs[node]
+            if key not in shared:
+                shared[key] = len(self.output_ids)
+                self.output_ids.extend(key)
+            state = new_id[node]
+            self.output_start[state] = shared[key]
+            self.output_end[state] = shared[key] + len(key)
+
+    def memory_usage(self) -> int:
+        # Perkiraan ukuran tabel automaton dalam byte
+        tables = (self.delta, self.output_start, self.output_end, self.output_ids, self.pattern_lengths)
+        return sum(t.itemsize * len(t) for t in tables)
+
+    def _encode(self, text: str):
+        # Ubah teks menjadi barisan id kelas alfabet (jalur cepat untuk ASCII)
+        if self._byte_table is not None:
+            if text.isascii():
+                return text.encode('ascii').translate(self._byte_table)
+            return text.translate(self._class_table).encode('latin-1')
+        return map(ord, text.translate(self._class_table))
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[str, int]]:
+        # Hasilkan pasangan (pattern, posisi awal), satu lookup tabel goto per karakter
+        if not self.patterns:
+            return
+        delta = self.delta
+        width = self.width
+        terminal_limit = self.terminal_limit
+        output_start = self.output_start
+        output_end = self.output_end
+        output_ids = self.output_ids
+        lengths = self.pattern_lengths
+        patterns = self.patterns
+        state = self.start_state
+        for i, cls in enumerate(self._encode(text)):
+            state = delta[state + cls]
+            if state < terminal_limit:
+                node = state // width
+                for k in range(output_start[node], output_end[node]):
+                    pattern_id = output_ids[k]
+                    yield patterns[pattern_id], i - lengths[pattern_id] + 1
+
+    def search(self, text: str) -> Dict[str, List[int]]:
+        # Cari semua pola, lalu kembalikan posisi kemunculannya
+        results = defaultdict(list)
+        for pattern, start_pos in self.iter_matches(text):
+            results[pattern].append(start_pos)
+        return dict(results)
+
+    def count(self, text: str, limit: Optional[int] = None) -> Dict[str, int]:
+        # Jumlah kemunculan tiap pola tanpa menyimpan posisi
+        return _count_matches(self.iter_matches(text), len(self.patterns), limit)
+
+    def contains(self, text: str) -> bool:
+        # True kalau salah satu pola muncul, berhenti di match pertama
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+    def scan_corpus(self, corpus: str, offsets: Sequence[int]) -> List[Dict[str, int]]:
+        # Satu kali pemindaian untuk seluruh korpus, hasil dihitung per dokumen
+        return _count_per_document(self.iter_matches(corpus), offsets)
+
+class AhoCorasickSearch:
+    ENGINES = {
+        "trie": AhoCorasickMatcher,
+        "flat": FlatAhoCorasickMatcher
+    }
+
+    def __init__(self, cache_size: int = 32, engine: str = "trie"):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown Aho-Corasick engine: {engine}")
+        self.root = TrieNode()
+        self.patterns = []
+        self.engine = engine
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add_pattern(self, pattern: str) -> None:
+        # Tambahkan satu pattern ke trie
+        if pattern not in self.patterns:
+            self.patterns.append(pattern)
+        _insert_pattern(self.root, pattern)
+
+    def build_failure_links(self) -> None:
+        # Bangun failure link
+        _link_failures(self.root)
+
+    def compile(self, patterns: List[str], engine: str = None):
+        # Ambil automaton dari cache LRU, bangun baru kalau belum ada
+        engine = engine or self.engine
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown Aho-Corasick engine: {engine}")
+        normalized = normalize_patterns(patterns)
+        key = (engine, normalized)
+        matcher = self._cache.get(key)
+        if matcher is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return matcher
+        self.cache_misses += 1
+        matcher = self.ENGINES[engine](normalized)
+        if self.cache_size > 0:
+            self._cache[key] = matcher
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return matcher
+
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "max_size": self.cache_size
+        }
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def search_multiple(self, text: str, patterns: List[str]) -> Dict[str, List[int]]:
+        # Cari semua pola, lalu kembalikan posisi kemunculannya
+        return self.compile(patterns).search(text)
+
+    def scan_corpus(self, texts: List[str], patterns: List[str]) -> List[Dict[str, int]]:
+        # Hitung kemunculan tiap pola di tiap dokumen dengan satu kali pemindaian
+        corpus, offsets = build_corpus(texts)
+        return self.compile(patterns).scan_corpus(corpus, offsets)
+
+    def count_multiple(self, text: str, patterns: List[str], limit: Optional[int] = None) -> Dict[str, int]:
+        # Hitung kemunculan semua pola tanpa menyimpan posisi
+        return self.compile(patterns).count(text, limit)
+
+    def contains_any(self, text: str, patterns: List[str]) -> bool:
+        # Cek apakah minimal satu pola muncul
+        return self.compile(patterns).contains(text)
+
     def search_single(self, text: str, pattern: str) -> List[int]:
         # Cari satu pola, lalu kembalikan semua posisi munculnya
         results = self.search_multiple(text, [pattern])
         return results.get(pattern, [])
-    
+
+    def count(self, text: str, pattern: str, limit: Optional[int] = None) -> int:
+        # Hitung kemunculan satu pola tanpa menyimpan posisi
+        return self.count_multiple(text, [pattern], limit).get(pattern.strip(), 0)
+
+    def contains(self, text: str, pattern: str) -> bool:
+        # Cek keberadaan satu pola, berhenti di kemunculan pertama
+        return self.contains_any(text, [pattern])
+
     def count_occurrences(self, text: str, pattern: str) -> int:
         # Hitung jumlah kemunculan satu pola
-        return len(self.search_single(text, pattern))
-    
-    def search_case_insensitive(self, text: str, patterns: List[str]) -> Dict[str, List[int]]:
-        # Tidak case sensitive
-        lower_text = text.lower()
-        lower_patterns = [p.lower() for p in patterns]
-        lower_results = self.search_multiple(lower_text, lower_patterns)
+        return self.count(text, pattern)
+
+    def search_case_insensitive(self, text: Union[str, NormalizedText], patterns: List[str]) -> Dict[str, List[int]]:
+        # Tidak case sensitive. NormalizedText dari tahap load dipakai langsung tanpa
+        # salinan lowercase, posisi hasilnya dipetakan kembali ke teks asli
+        if isinstance(text, NormalizedText):
+            lower_patterns = [normalize_query(p) for p in patterns]
+            lower_results = self.search_multiple(text.text, lower_patterns)
+            lower_results = {p: [text.original_position(pos) for pos in positions]
+                             for p, positions in lower_results.items()}
+        else:
+            lower_patterns = [p.lower() for p in patterns]
+            lower_results = self.search_multiple(text.lower(), lower_patterns)
         results = {}
         for i, original_pattern in enumerate(patterns):
             lower_pattern = lower_patterns[i]
             if lower_pattern in lower_results:
                 results[original_pattern] = lower_results[lower_pattern]
         return results
-    
+
     def find_all_matches(self, text: str, patterns: List[str]) -> List[Dict]:
         # Kebalikan detail match
         results = self.search_multiple(text, patterns)
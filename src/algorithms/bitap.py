@@ -0,0 +1,129 @@
+from typing import List, Dict, Optional
+
+# Panjang pattern yang muat di satu machine word. Pattern lebih panjang tetap
+# benar karena int Python tidak terbatas, hanya saja operasinya lebih lambat.
+WORD_SIZE = 64
+
+class BitapPattern:
+    """
+    Pattern Shift-And (Bitap) yang sudah dikompilasi. Bit ke-j pada state
+    menandakan pattern[0..j] cocok dengan suffix teks yang sudah dibaca,
+    sehingga satu karakter cukup diproses dengan beberapa operasi integer.
+    Varian approximate mengikuti Wu-Manber (agrep) untuk k edit
+    (insert, delete, substitusi).
+    """
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.length = len(pattern)
+        self.full_mask = (1 << self.length) - 1
+        self.accept = 1 << (self.length - 1) if pattern else 0
+        masks: Dict[str, int] = {}
+        for i, char in enumerate(pattern):
+            masks[char] = masks.get(char, 0) | (1 << i)
+        self.masks = masks
+
+    def _scan_exact(self, text: str, limit: Optional[int], positions: Optional[List[int]]) -> int:
+        if not self.pattern or not text:
+            return 0
+        masks = self.masks
+        accept = self.accept
+        m = self.length
+        found = 0
+        state = 0
+        for i, char in enumerate(text):
+            state = ((state << 1) | 1) & masks.get(char, 0)
+            if state & accept:
+                found += 1
+                if positions is not None:
+                    positions.append(i - m + 1)
+                if limit is not None and found >= limit:
+                    return found
+        return found
+
+    def search_all(self, text: str) -> List[int]:
+        # Semua posisi awal kemunculan exact
+        positions = []
+        self._scan_exact(text, None, positions)
+        return positions
+
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        # Hitung kemunculan exact tanpa menyimpan posisi
+        return self._scan_exact(text, limit, None)
+
+    def contains(self, text: str) -> bool:
+        # Cek kemunculan exact, berhenti di match pertama
+        return self._scan_exact(text, 1, None) > 0
+
+    def search_approximate(self, text: str, max_errors: int) -> List[int]:
+        # Posisi akhir (inklusif) setiap substring teks yang berjarak edit <= max_errors dari pattern
+        if not self.pattern or not text:
+            return []
+        if max_errors <= 0:
+            return [pos + self.length - 1 for pos in self.search_all(text)]
+        masks = self.masks
+        accept = self.accept
+        full = self.full_mask
+        k = min(max_errors, self.length)
+        # Bit 0..d-1 menyala di awal: prefix sepanjang d cocok dengan d kali delete
+        states = [(1 << d) - 1 for d in range(k + 1)]
+        ends = []
+        for i, char in enumerate(text):
+            mask = masks.get(char, 0)
+            prev_old = states[0]
+            prev_new = ((prev_old << 1) | 1) & mask
+            states[0] = prev_new
+            for d in range(1, k + 1):
+                old = states[d]
+                # match | insert | (substitusi dan delete)
+                new = ((((old << 1) | 1) & mask) | prev_old | ((prev_old | prev_new) << 1) | 1) & full
+                states[d] = new
+                prev_old = old
+                prev_new = new
+            if prev_new & accept:
+                ends.append(i)
+        return ends
+
+    def count_approximate(self, text: str, max_errors: int) -> int:
+        """
+        Hitung kemunculan approximate yang tidak saling tumpang tindih. Match
+        terpendek panjangnya len(pattern) - k, jadi setelah match berakhir di
+        posisi e, match berikutnya baru dihitung kalau berakhir paling cepat
+        di e + len(pattern) - k. Ini menghitung substring teks (bisa melewati
+        batas kata), berbeda dengan engine fuzzy lain yang menghitung kata
+        unik yang mirip keyword, jadi angkanya tidak selalu sama.
+        """
+        k = min(max(max_errors, 0), self.length)
+        step = max(1, self.length - k)
+        found = 0
+        next_end = 0
+        for end in self.search_approximate(text, max_errors):
+            if end >= next_end:
+                found += 1
+                next_end = end + step
+        return found
+
+    def contains_approximate(self, text: str, max_errors: int) -> bool:
+        return bool(self.search_approximate(text, max_errors))
+
+class BitapSearch:
+    def __init__(self):
+        pass
+
+    def compile(self, pattern: str) -> BitapPattern:
+        # Kompilasi bitmask pattern sekali, lalu pakai ulang untuk banyak teks
+        return BitapPattern(pattern)
+
+    def search_all(self, text: str, pattern: str) -> List[int]:
+        return self.compile(pattern).search_all(text)
+
+    def count(self, text: str, pattern: str, limit: Optional[int] = None) -> int:
+        return self.compile(pattern).count(text, limit)
+
+    def contains(self, text: str, pattern: str) -> bool:
+        return self.compile(pattern).contains(text)
+
+    def search_approximate(self, text: str, pattern: str, max_errors: int) -> List[int]:
+        return self.compile(pattern).search_approximate(text, max_errors)
+
+    def count_approximate(self, text: str, pattern: str, max_errors: int) -> int:
+        return self.compile(pattern).count_approximate(text, max_errors)
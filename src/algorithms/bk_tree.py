@@ -0,0 +1,66 @@
+from typing import List, Tuple, Iterable, Optional
+
+from .levenshtein import LevenshteinDistance
+
+class BKNode:
+    __slots__ = ('word', 'children')
+
+    def __init__(self, word: str):
+        self.word = word
+        self.children = {}
+
+class BKTree:
+    """
+    Burkhard-Keller tree di atas jarak Levenshtein. Anak tiap node
+    dikelompokkan menurut jaraknya ke node tersebut, sehingga pencarian
+    dengan toleransi k cukup menelusuri anak berjarak d-k sampai d+k
+    (ketaksamaan segitiga) dan memangkas subtree lainnya.
+    """
+    def __init__(self, words: Optional[Iterable[str]] = None):
+        self.levenshtein = LevenshteinDistance()
+        self.root = None
+        self.size = 0
+        if words:
+            for word in words:
+                self.add(word)
+
+    def add(self, word: str) -> None:
+        if self.root is None:
+            self.root = BKNode(word)
+            self.size = 1
+            return
+        compiled = self.levenshtein.compile(word)
+        node = self.root
+        while True:
+            d = compiled.distance(node.word)
+            if d == 0:
+                return
+            child = node.children.get(d)
+            if child is None:
+                node.children[d] = BKNode(word)
+                self.size += 1
+                return
+            node = child
+
+    def search(self, query: str, max_dist: int) -> List[Tuple[str, int]]:
+        # Semua kata dengan jarak edit <= max_dist dari query
+        if self.root is None or max_dist < 0:
+            return []
+        compiled = self.levenshtein.compile(query)
+        results = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            d = compiled.distance(node.word)
+            if d <= max_dist:
+                results.append((node.word, d))
+            low = d - max_dist
+            high = d + max_dist
+            for child_dist, child in node.children.items():
+                if low <= child_dist <= high:
+                    stack.append(child)
+        results.sort(key=lambda x: (x[1], x[0]))
+        return results
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,88 @@
+import hmac
+import hashlib
+import re
+from typing import List, Set, Tuple, Union
+
+from .text_normalizer import normalize_query
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+class BlindIndex:
+    """
+    Blind index untuk field terenkripsi: HMAC-SHA256 (dipotong) dari nilai
+    yang sudah dinormalisasi. Hash deterministik sehingga bisa disimpan di
+    kolom ber-index dan dicocokkan dengan "=" di database, tapi tanpa key
+    tidak bisa dibalik ke plaintext. Nama field ikut di-hash supaya token
+    yang sama di field berbeda tidak menghasilkan hash yang sama.
+
+    Jenis hash: "e" (nilai utuh, exact match), "t" (per token) dan "p"
+    (prefix token sepanjang min_prefix..max_prefix untuk pencarian prefix).
+    """
+    def __init__(self, key: Union[str, bytes] = "ATS_SECURE_KEY_2025", hash_length: int = 16,
+                 min_prefix: int = 3, max_prefix: int = 8):
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        # Key blind index diturunkan terpisah dari key enkripsi
+        self.key = hashlib.sha256(b"ats-blind-index:" + key).digest()
+        self.hash_length = hash_length
+        self.min_prefix = min_prefix
+        self.max_prefix = max_prefix
+
+    def _hash(self, field: str, kind: str, value: str) -> str:
+        message = f"{field}|{kind}|{value}".encode('utf-8', 'surrogatepass')
+        return hmac.new(self.key, message, hashlib.sha256).hexdigest()[:self.hash_length * 2]
+
+    @staticmethod
+    def tokenize(value: str) -> List[str]:
+        return _TOKEN_PATTERN.findall(normalize_query(value))
+
+    def exact_hash(self, field: str, value: str) -> str:
+        return self._hash(field, "e", ' '.join(self.tokenize(value)))
+
+    def token_hash(self, field: str, token: str) -> str:
+        return self._hash(field, "t", token)
+
+    def prefix_hash(self, field: str, prefix: str) -> str:
+        return self._hash(field, "p", prefix[:self.max_prefix])
+
+    def index_hashes(self, field: str, value: str) -> Set[Tuple[str, str]]:
+        # Semua (jenis, hash) yang disimpan untuk satu nilai field
+        if value is None or value == "":
+            return set()
+        tokens = self.tokenize(str(value))
+        hashes = {("e", self._hash(field, "e", ' '.join(tokens)))}
+        for token in tokens:
+            hashes.add(("t", self.token_hash(field, token)))
+            for length in range(self.min_prefix, min(len(token), self.max_prefix) + 1):
+                hashes.add(("p", self._hash(field, "p", token[:length])))
+        return hashes
+
+    def query_hashes(self, field: str, value: str, prefix: bool = False) -> List[str]:
+        # Hash yang harus dimiliki baris agar cocok: semua token query exact, token
+        # terakhir boleh prefix kalau prefix=True. Kosong kalau query tidak bisa dijawab index
+        tokens = self.tokenize(value)
+        if not tokens:
+            return []
+        hashes = [self.token_hash(field, token) for token in tokens[:-1]]
+        last = tokens[-1]
+        if not prefix:
+            hashes.append(self.token_hash(field, last))
+        elif len(last) >= self.min_prefix:
+            hashes.append(self.prefix_hash(field, last))
+        elif not hashes:
+            return []
+        return list(dict.fromkeys(hashes))
+
+    def matches(self, value: str, query: str, prefix: bool = False) -> bool:
+        # Verifikasi setelah dekripsi: menyaring tabrakan hash dan prefix yang dipotong max_prefix
+        tokens = self.tokenize(value or "")
+        query_tokens = self.tokenize(query)
+        if not query_tokens:
+            return False
+        token_set = set(tokens)
+        if any(token not in token_set for token in query_tokens[:-1]):
+            return False
+        last = query_tokens[-1]
+        if prefix:
+            return any(token.startswith(last) for token in tokens)
+        return last in token_set
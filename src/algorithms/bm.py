@@ -1,90 +1,358 @@
-from typing import List, Dict
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, Union
+from array import array
 
-class BoyerMooreSearch:
-    def __init__(self):
-        pass
-    
-    def bad_char_heuristic(self, pattern: str) -> Dict[str, int]:
-        # Buat tabel posisi terakhir tiap karakter dalam pattern
-        bad_char = {}
-        m = len(pattern)
-        for i in range(256):
-            bad_char[chr(i)] = -1
-        for i in range(m):
-            bad_char[pattern[i]] = i
-        return bad_char
-    
-    def good_suffix_heuristic(self, pattern: str) -> List[int]:
-        # Tabel pergeseran berdasarkan suffix yang cocok
-        m = len(pattern)
-        shift = [0] * (m + 1)
-        border = [0] * (m + 1)
-        i = m
-        j = m + 1
+from .text_normalizer import NormalizedText, normalize_query
+
+def _good_suffix_table(pattern: str) -> List[int]:
+    # Tabel pergeseran berdasarkan suffix yang cocok
+    m = len(pattern)
+    shift = [0] * (m + 1)
+    border = [0] * (m + 1)
+    i = m
+    j = m + 1
+    border[i] = j
+    while i > 0:
+        while j <= m and pattern[i - 1] != pattern[j - 1]:
+            if shift[j] == 0:
+                shift[j] = j - i
+            j = border[j]
+        i -= 1
+        j -= 1
         border[i] = j
-        while i > 0:
-            while j <= m and pattern[i - 1] != pattern[j - 1]:
-                if shift[j] == 0:
-                    shift[j] = j - i
-                j = border[j]
-            i -= 1
-            j -= 1
-            border[i] = j
-        j = border[0]
-        for i in range(m + 1):
-            if shift[i] == 0:
-                shift[i] = j
-            if i == j:
-                j = border[j]
-        return shift
-    
-    def search(self, text: str, pattern: str) -> int:
-        # Cari kemunculan pertama dari pattern 
+    j = border[0]
+    for i in range(m + 1):
+        if shift[i] == 0:
+            shift[i] = j
+        if i == j:
+            j = border[j]
+    return shift
+
+class _CompiledPattern(ABC):
+    # Dasar pattern terkompilasi: immutable, turunan cukup mengisi _scan
+    __slots__ = ('pattern',)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @abstractmethod
+    def _scan(self, text: str, limit: Optional[int], positions: Optional[List[int]]) -> int:
+        # Pindai text, simpan posisi match ke positions kalau diberikan, kembalikan jumlah match
+        ...
+
+    def search(self, text: str) -> int:
+        # Cari kemunculan pertama dari pattern
+        positions = []
+        self._scan(text, 1, positions)
+        return positions[0] if positions else -1
+
+    def search_all(self, text: str) -> List[int]:
+        # Cari semua kemunculan pattern
+        positions = []
+        self._scan(text, None, positions)
+        return positions
+
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        # Hitung kemunculan tanpa menyimpan posisi, berhenti kalau sudah mencapai limit
+        return self._scan(text, limit, None)
+
+    def contains(self, text: str) -> bool:
+        # Cek keberadaan pattern, berhenti di kemunculan pertama
+        return self._scan(text, 1, None) > 0
+
+def _shift_table(pattern: str, stop: int, default: int):
+    # Tabel geser per karakter: array untuk 256 code point pertama, dict untuk sisanya.
+    # Karakter pattern[i] (i < stop) mendapat nilai stop - i dari kemunculan terakhirnya
+    table = array('i', [default] * 256)
+    extra = {}
+    for i in range(stop):
+        char = pattern[i]
+        if ord(char) < 256:
+            table[ord(char)] = stop - i
+        else:
+            extra[char] = stop - i
+    return table, extra
+
+class BoyerMoorePattern(_CompiledPattern):
+    """
+    Pattern Boyer-Moore yang sudah dikompilasi. Tabel bad character berupa
+    array untuk 256 code point pertama, karakter Unicode lain yang ada di
+    pattern disimpan di dict kecil (sparse), sisanya bernilai -1.
+    """
+    __slots__ = ('bad_char', 'bad_char_extra', 'good_suffix')
+
+    def __init__(self, pattern: str):
+        bad_char = array('i', [-1] * 256)
+        bad_char_extra = {}
+        for i, char in enumerate(pattern):
+            if ord(char) < 256:
+                bad_char[ord(char)] = i
+            else:
+                bad_char_extra[char] = i
+        object.__setattr__(self, 'pattern', pattern)
+        object.__setattr__(self, 'bad_char', bad_char)
+        object.__setattr__(self, 'bad_char_extra', bad_char_extra)
+        object.__setattr__(self, 'good_suffix', array('i', _good_suffix_table(pattern)))
+
+    def last_occurrence(self, char: str) -> int:
+        # Posisi terakhir karakter di pattern, -1 kalau tidak ada
+        code = ord(char)
+        if code < 256:
+            return self.bad_char[code]
+        return self.bad_char_extra.get(char, -1)
+
+    def _scan(self, text: str, limit: Optional[int], positions: Optional[List[int]]) -> int:
+        # Loop Boyer-Moore bersama: hitung match, simpan posisi kalau positions diberikan
+        pattern = self.pattern
         if not pattern or not text:
-            return -1
+            return 0
+        bad_char = self.bad_char
+        bad_char_extra = self.bad_char_extra
+        good_suffix = self.good_suffix
         n = len(text)
         m = len(pattern)
-        bad_char = self.bad_char_heuristic(pattern)
-        good_suffix = self.good_suffix_heuristic(pattern)
+        found = 0
         s = 0
         while s <= n - m:
             j = m - 1
             while j >= 0 and pattern[j] == text[s + j]:
                 j -= 1
             if j < 0:
-                return s
+                found += 1
+                if positions is not None:
+                    positions.append(s)
+                if limit is not None and found >= limit:
+                    return found
+                s += good_suffix[0]
             else:
-                bad_char_shift = j - bad_char.get(text[s + j], -1)
+                char = text[s + j]
+                code = ord(char)
+                last = bad_char[code] if code < 256 else bad_char_extra.get(char, -1)
+                bad_char_shift = j - last
                 good_suffix_shift = good_suffix[j + 1]
-                s += max(bad_char_shift, good_suffix_shift)
-        return -1
-    
-    def search_all(self, text: str, pattern: str) -> List[int]:
-        # Cari semua kemunculan pattern 
+                s += bad_char_shift if bad_char_shift > good_suffix_shift else good_suffix_shift
+        return found
+
+class HorspoolPattern(_CompiledPattern):
+    # Boyer-Moore-Horspool: hanya bad character dari karakter terakhir jendela
+    __slots__ = ('shift', 'shift_extra')
+
+    def __init__(self, pattern: str):
+        m = len(pattern)
+        shift, shift_extra = _shift_table(pattern, m - 1, m)
+        object.__setattr__(self, 'pattern', pattern)
+        object.__setattr__(self, 'shift', shift)
+        object.__setattr__(self, 'shift_extra', shift_extra)
+
+    def _scan(self, text: str, limit: Optional[int], positions: Optional[List[int]]) -> int:
+        pattern = self.pattern
         if not pattern or not text:
-            return []
-        positions = []
+            return 0
+        shift = self.shift
+        shift_extra = self.shift_extra
         n = len(text)
         m = len(pattern)
-        bad_char = self.bad_char_heuristic(pattern)
-        good_suffix = self.good_suffix_heuristic(pattern)
+        last_char = pattern[-1]
+        found = 0
         s = 0
         while s <= n - m:
-            j = m - 1
-            while j >= 0 and pattern[j] == text[s + j]:
-                j -= 1
-            if j < 0:
-                positions.append(s)
-                s += good_suffix[0]
+            char = text[s + m - 1]
+            if char == last_char and text.startswith(pattern, s):
+                found += 1
+                if positions is not None:
+                    positions.append(s)
+                if limit is not None and found >= limit:
+                    return found
+            code = ord(char)
+            s += shift[code] if code < 256 else shift_extra.get(char, m)
+        return found
+
+class SundayPattern(_CompiledPattern):
+    # Quick Search (Sunday): geser berdasarkan karakter tepat setelah jendela
+    __slots__ = ('shift', 'shift_extra')
+
+    def __init__(self, pattern: str):
+        m = len(pattern)
+        shift, shift_extra = _shift_table(pattern, m, m + 1)
+        object.__setattr__(self, 'pattern', pattern)
+        object.__setattr__(self, 'shift', shift)
+        object.__setattr__(self, 'shift_extra', shift_extra)
+
+    def _scan(self, text: str, limit: Optional[int], positions: Optional[List[int]]) -> int:
+        pattern = self.pattern
+        if not pattern or not text:
+            return 0
+        shift = self.shift
+        shift_extra = self.shift_extra
+        n = len(text)
+        m = len(pattern)
+        first_char = pattern[0]
+        found = 0
+        s = 0
+        while s <= n - m:
+            if text[s] == first_char and text.startswith(pattern, s):
+                found += 1
+                if positions is not None:
+                    positions.append(s)
+                if limit is not None and found >= limit:
+                    return found
+            if s + m >= n:
+                break
+            char = text[s + m]
+            code = ord(char)
+            s += shift[code] if code < 256 else shift_extra.get(char, m + 1)
+        return found
+
+def _maximal_suffix(pattern: str, reverse: bool):
+    # Maximal suffix pattern untuk urutan <= (reverse=False) atau >= (reverse=True),
+    # mengembalikan (posisi sebelum suffix, periode suffix)
+    m = len(pattern)
+    ms = -1
+    j = 0
+    k = p = 1
+    while j + k < m:
+        a = pattern[j + k]
+        b = pattern[ms + k]
+        if (a > b) if reverse else (a < b):
+            j += k
+            k = 1
+            p = j - ms
+        elif a == b:
+            if k != p:
+                k += 1
             else:
-                bad_char_shift = j - bad_char.get(text[s + j], -1)
-                good_suffix_shift = good_suffix[j + 1]
-                s += max(bad_char_shift, good_suffix_shift)
-        return positions
-    
+                j += p
+                k = 1
+        else:
+            ms = j
+            j = ms + 1
+            k = p = 1
+    return ms, p
+
+class TwoWayPattern(_CompiledPattern):
+    # Crochemore-Perrin Two-Way: ruang tambahan konstan dan waktu linear di kasus terburuk
+    __slots__ = ('ell', 'period', 'periodic')
+
+    def __init__(self, pattern: str):
+        i, p = _maximal_suffix(pattern, False)
+        j, q = _maximal_suffix(pattern, True)
+        ell, period = (i, p) if i > j else (j, q)
+        periodic = pattern[:ell + 1] == pattern[period:period + ell + 1]
+        if not periodic:
+            period = max(ell + 1, len(pattern) - ell - 1) + 1
+        object.__setattr__(self, 'pattern', pattern)
+        object.__setattr__(self, 'ell', ell)
+        object.__setattr__(self, 'period', period)
+        object.__setattr__(self, 'periodic', periodic)
+
+    def _scan(self, text: str, limit: Optional[int], positions: Optional[List[int]]) -> int:
+        pattern = self.pattern
+        if not pattern or not text:
+            return 0
+        ell = self.ell
+        period = self.period
+        n = len(text)
+        m = len(pattern)
+        found = 0
+        s = 0
+        memory = -1
+        while s <= n - m:
+            # Bagian kanan dicocokkan dari kiri ke kanan
+            i = (ell if ell > memory else memory) + 1
+            while i < m and pattern[i] == text[s + i]:
+                i += 1
+            if i < m:
+                s += i - ell
+                memory = -1
+                continue
+            # Bagian kiri dicocokkan dari kanan ke kiri
+            i = ell
+            while i > memory and pattern[i] == text[s + i]:
+                i -= 1
+            if i <= memory:
+                found += 1
+                if positions is not None:
+                    positions.append(s)
+                if limit is not None and found >= limit:
+                    return found
+            s += period
+            if self.periodic:
+                memory = m - period - 1
+        return found
+
+class BoyerMooreSearch:
+    VARIANTS = {
+        "classic": BoyerMoorePattern,
+        "horspool": HorspoolPattern,
+        "sunday": SundayPattern,
+        "two_way": TwoWayPattern
+    }
+
+    def __init__(self, variant: str = "classic"):
+        if variant != "auto" and variant not in self.VARIANTS:
+            raise ValueError(f"Unknown Boyer-Moore variant: {variant}")
+        self.variant = variant
+
+    def bad_char_heuristic(self, pattern: str) -> Dict[str, int]:
+        # Buat tabel posisi terakhir tiap karakter dalam pattern
+        bad_char = {}
+        m = len(pattern)
+        for i in range(256):
+            bad_char[chr(i)] = -1
+        for i in range(m):
+            bad_char[pattern[i]] = i
+        return bad_char
+
+    def good_suffix_heuristic(self, pattern: str) -> List[int]:
+        # Tabel pergeseran berdasarkan suffix yang cocok
+        return _good_suffix_table(pattern)
+
+    def select_variant(self, pattern: str) -> str:
+        # Pilih varian berdasarkan panjang pattern dan ukuran alfabetnya
+        m = len(pattern)
+        alphabet_size = len(set(pattern))
+        if m >= 8 and alphabet_size * 4 <= m:
+            # Pattern panjang dengan alfabet kecil (sangat berulang): varian
+            # bad character bisa jatuh ke O(nm), Two-Way menjamin waktu linear
+            return "two_way"
+        if m <= 3:
+            # Pattern sangat pendek: Sunday memberi geser maksimum m + 1
+            return "sunday"
+        return "horspool"
+
+    def compile(self, pattern: str, variant: Optional[str] = None) -> _CompiledPattern:
+        # Kompilasi pattern sekali, lalu pakai ulang untuk banyak teks
+        variant = variant or self.variant
+        if variant == "auto":
+            variant = self.select_variant(pattern)
+        if variant not in self.VARIANTS:
+            raise ValueError(f"Unknown Boyer-Moore variant: {variant}")
+        return self.VARIANTS[variant](pattern)
+
+    def search(self, text: str, pattern: str) -> int:
+        # Cari kemunculan pertama dari pattern
+        return self.compile(pattern).search(text)
+
+    def search_all(self, text: str, pattern: str) -> List[int]:
+        # Cari semua kemunculan pattern
+        return self.compile(pattern).search_all(text)
+
+    def count(self, text: str, pattern: str, limit: Optional[int] = None) -> int:
+        # Hitung kemunculan tanpa menyimpan posisi, berhenti kalau sudah mencapai limit
+        return self.compile(pattern).count(text, limit)
+
+    def contains(self, text: str, pattern: str) -> bool:
+        # Cek keberadaan pattern, berhenti di kemunculan pertama
+        return self.compile(pattern).contains(text)
+
     def count_occurrences(self, text: str, pattern: str) -> int:
         # Hitung jumlah kemunculan pattern
-        return len(self.search_all(text, pattern))
-    
-    def search_case_insensitive(self, text: str, pattern: str) -> List[int]:
+        return self.count(text, pattern)
+
+    def search_case_insensitive(self, text: Union[str, NormalizedText], pattern: str) -> List[int]:
+        # NormalizedText dari tahap load dipakai langsung tanpa salinan lowercase,
+        # posisi hasilnya dipetakan kembali ke teks asli
+        if isinstance(text, NormalizedText):
+            positions = self.search_all(text.text, normalize_query(pattern))
+            return [text.original_position(pos) for pos in positions]
         return self.search_all(text.lower(), pattern.lower())
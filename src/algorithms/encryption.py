@@ -1,12 +1,54 @@
 import base64
+import codecs
+import csv
 import secrets
 import string
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+# Ukuran potongan default untuk API streaming (karakter)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+SUBSTITUTION_NORMAL = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+SUBSTITUTION_CIPHER = "ZYXWVUTSRQPONMLKJIHGFEDCBAzyxwvutsrqponmlkjihgfedcba9876543210"
+SUBSTITUTION_ENCRYPT = str.maketrans(SUBSTITUTION_NORMAL, SUBSTITUTION_CIPHER)
+SUBSTITUTION_DECRYPT = str.maketrans(SUBSTITUTION_CIPHER, SUBSTITUTION_NORMAL)
+
+def _caesar_char(char: str, shift: int) -> str:
+    # Caesar satu karakter, aturan sama dengan implementasi awal: huruf apa pun
+    # (termasuk non-ASCII) dipetakan ke A-Z / a-z, selain huruf tidak berubah
+    if char.isalpha():
+        ascii_offset = 65 if char.isupper() else 97
+        return chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
+    return char
+
+class _TranslationTable(dict):
+    # Tabel str.translate: ASCII diisi di awal, karakter lain dihitung saat pertama kali muncul
+    def __init__(self, convert: Callable[[str], str]):
+        super().__init__()
+        self.convert = convert
+        for code in range(128):
+            self[code] = convert(chr(code))
+
+    def __missing__(self, code: int) -> str:
+        value = self.convert(chr(code))
+        self[code] = value
+        return value
 
 class DataEncryption:
     def __init__(self, key: str = "ATS_SECURE_KEY_2025"):
         self.key = key
         self.caesar_shift = self._generate_caesar_shift(key)
         self.xor_key = self._generate_xor_key(key)
+        self._build_tables()
+
+    def _build_tables(self) -> None:
+        # Substitusi + Caesar digabung menjadi satu tabel translate per arah
+        shift = self.caesar_shift
+        self._caesar_tables: Dict[int, _TranslationTable] = {}
+        self._encrypt_table = _TranslationTable(
+            lambda c: _caesar_char(c.translate(SUBSTITUTION_ENCRYPT), shift))
+        self._decrypt_table = _TranslationTable(
+            lambda c: _caesar_char(c, -shift).translate(SUBSTITUTION_DECRYPT))
 
     def _generate_caesar_shift(self, key: str) -> int:
         shift = sum(ord(c) for c in key) % 26
@@ -16,35 +58,35 @@ class DataEncryption:
         key_bytes = key.encode("utf-8")
         return (key_bytes * (16 // len(key_bytes) + 1))[:16]
 
+    def _caesar_table(self, shift: int) -> _TranslationTable:
+        table = self._caesar_tables.get(shift)
+        if table is None:
+            table = self._caesar_tables[shift] = _TranslationTable(lambda c: _caesar_char(c, shift))
+        return table
+
     def _caesar_encrypt(self, text: str, shift: int) -> str:
-        result = ""
-        for char in text:
-            if char.isalpha():
-                ascii_offset = 65 if char.isupper() else 97
-                shifted = (ord(char) - ascii_offset + shift) % 26
-                result += chr(shifted + ascii_offset)
-            else:
-                result += char
-        return result
+        return text.translate(self._caesar_table(shift))
 
     def _caesar_decrypt(self, text: str, shift: int) -> str:
         return self._caesar_encrypt(text, -shift)
 
     def _xor_encrypt_decrypt(self, data: bytes, key: bytes) -> bytes:
-        key_len = len(key)
-        return bytes([b ^ key[i % key_len] for i, b in enumerate(data)])
+        # XOR seluruh data sekaligus sebagai satu integer besar dengan key stream berulang
+        n = len(data)
+        if n == 0:
+            return b""
+        key_stream = (key * (n // len(key) + 1))[:n]
+        value = int.from_bytes(data, 'little') ^ int.from_bytes(key_stream, 'little')
+        return value.to_bytes(n, 'little')
 
     def _custom_substitution(self, text: str, encrypt: bool = True) -> str:
-        normal = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-        cipher = "ZYXWVUTSRQPONMLKJIHGFEDCBAzyxwvutsrqponmlkjihgfedcba9876543210"
-        trans_table = str.maketrans(normal, cipher) if encrypt else str.maketrans(cipher, normal)
-        return text.translate(trans_table)
+        return text.translate(SUBSTITUTION_ENCRYPT if encrypt else SUBSTITUTION_DECRYPT)
 
     def encrypt(self, plaintext: str) -> str:
         if not plaintext:
             return ""
-        step1 = self._custom_substitution(plaintext, encrypt=True)
-        step2 = self._caesar_encrypt(step1, self.caesar_shift)
+        # Substitusi dan Caesar dalam satu translate
+        step2 = plaintext.translate(self._encrypt_table)
         step3_bytes = step2.encode('utf-8')
         step3_encrypted = self._xor_encrypt_decrypt(step3_bytes, self.xor_key)
         return base64.b64encode(step3_encrypted).decode('utf-8')
@@ -55,8 +97,108 @@ class DataEncryption:
         step1_bytes = base64.b64decode(ciphertext.encode('utf-8'))
         step2_bytes = self._xor_encrypt_decrypt(step1_bytes, self.xor_key)
         step2 = step2_bytes.decode('utf-8')
-        step3 = self._caesar_decrypt(step2, self.caesar_shift)
-        return self._custom_substitution(step3, encrypt=False)
+        return step2.translate(self._decrypt_table)
+
+    def encrypt_many(self, plaintexts: Iterable[Optional[str]]) -> List[str]:
+        # Enkripsi banyak field sekaligus: satu XOR untuk gabungan semua field,
+        # key stream diulang dari awal untuk setiap field sehingga hasilnya sama dengan encrypt()
+        encoded = [text.translate(self._encrypt_table).encode('utf-8') if text else b"" for text in plaintexts]
+        return [base64.b64encode(data).decode('utf-8') if data else "" for data in self._xor_many(encoded)]
+
+    def decrypt_many(self, ciphertexts: Iterable[Optional[str]]) -> List[str]:
+        # Kebalikan encrypt_many, hasilnya sama dengan decrypt() per field
+        raw = [base64.b64decode(text.encode('utf-8')) if text else b"" for text in ciphertexts]
+        return [data.decode('utf-8').translate(self._decrypt_table) if data else "" for data in self._xor_many(raw)]
+
+    def _xor_many(self, chunks: List[bytes]) -> List[bytes]:
+        if not chunks:
+            return []
+        key = self.xor_key
+        longest = max(len(chunk) for chunk in chunks)
+        full_stream = key * (longest // len(key) + 1)
+        data = b"".join(chunks)
+        key_stream = b"".join(full_stream[:len(chunk)] for chunk in chunks)
+        mixed = self._xor_encrypt_decrypt(data, key_stream) if data else b""
+        results = []
+        position = 0
+        for chunk in chunks:
+            results.append(mixed[position:position + len(chunk)])
+            position += len(chunk)
+        return results
+
+    def _xor_at(self, data: bytes, position: int) -> bytes:
+        # XOR dengan key stream yang dimulai dari posisi byte tertentu
+        key = self.xor_key
+        start = position % len(key)
+        return self._xor_encrypt_decrypt(data, key[start:] + key[:start])
+
+    @staticmethod
+    def _iter_chunks(source: Union[str, TextIO, Iterable[str]], chunk_size: int) -> Iterator[str]:
+        # Terima string, file-like (punya read) atau iterator potongan string
+        if isinstance(source, str):
+            for start in range(0, len(source), chunk_size):
+                yield source[start:start + chunk_size]
+        elif hasattr(source, 'read'):
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            for chunk in source:
+                if chunk:
+                    yield chunk
+
+    def encrypt_stream(self, source: Union[str, TextIO, Iterable[str]], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Enkripsi bertahap: setiap potongan di-translate, di-encode dan di-XOR
+        dengan posisi key stream yang berlanjut antar potongan. Base64 hanya
+        dikeluarkan per kelipatan 3 byte, sehingga gabungan output sama persis
+        dengan encrypt() untuk teks utuh.
+        """
+        position = 0
+        pending = b""
+        for chunk in self._iter_chunks(source, chunk_size):
+            data = chunk.translate(self._encrypt_table).encode('utf-8')
+            pending += self._xor_at(data, position)
+            position += len(data)
+            aligned = len(pending) - len(pending) % 3
+            if aligned:
+                yield base64.b64encode(pending[:aligned]).decode('ascii')
+                pending = pending[aligned:]
+        if pending:
+            yield base64.b64encode(pending).decode('ascii')
+
+    def decrypt_stream(self, source: Union[str, TextIO, Iterable[str]], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+        # Kebalikan encrypt_stream: base64 didekode per kelipatan 4 karakter dan
+        # UTF-8 didekode inkremental karena satu karakter bisa terpotong antar chunk
+        position = 0
+        pending = ""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for chunk in self._iter_chunks(source, chunk_size):
+            pending += ''.join(chunk.split())
+            aligned = len(pending) - len(pending) % 4
+            if not aligned:
+                continue
+            data = base64.b64decode(pending[:aligned])
+            pending = pending[aligned:]
+            text = decoder.decode(self._xor_at(data, position))
+            position += len(data)
+            if text:
+                yield text.translate(self._decrypt_table)
+        if pending:
+            raise ValueError("Incomplete base64 input in encrypted stream")
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text.translate(self._decrypt_table)
+
+    def encrypt_file(self, source: TextIO, target: TextIO, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        for piece in self.encrypt_stream(source, chunk_size):
+            target.write(piece)
+
+    def decrypt_file(self, source: TextIO, target: TextIO, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        for piece in self.decrypt_stream(source, chunk_size):
+            target.write(piece)
 
     def encrypt_dict(self, data_dict: dict, fields_to_encrypt: list) -> dict:
         encrypted_dict = data_dict.copy()
@@ -79,6 +221,7 @@ class DataEncryption:
         self.key = new_key
         self.caesar_shift = self._generate_caesar_shift(new_key)
         self.xor_key = self._generate_xor_key(new_key)
+        self._build_tables()
 
     def get_encryption_info(self) -> dict:
         return {
@@ -96,32 +239,65 @@ def generate_secure_key(length: int = 32) -> str:
     alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
     return ''.join(secrets.choice(alphabet) for _ in range(length))
 
+SENSITIVE_CV_FIELDS = [
+    'name', 'email', 'phone', 'address',
+    'personal_info', 'contact_details'
+]
+
+_default_encryption = None
+
+def get_default_encryption() -> DataEncryption:
+    # Satu instance bersama dengan key default, tabel translate-nya dibangun sekali
+    global _default_encryption
+    if _default_encryption is None:
+        _default_encryption = DataEncryption()
+    return _default_encryption
+
 def encrypt_sensitive_cv_data(cv_data: dict) -> dict:
-    encryption = DataEncryption()
-    sensitive_fields = [
-        'name', 'email', 'phone', 'address',
-        'personal_info', 'contact_details'
-    ]
+    encryption = get_default_encryption()
     encrypted_data = cv_data.copy()
-    for field in sensitive_fields:
+    for field in SENSITIVE_CV_FIELDS:
         if field in encrypted_data and encrypted_data[field]:
             if isinstance(encrypted_data[field], str):
                 encrypted_data[field] = encryption.encrypt(encrypted_data[field])
             elif isinstance(encrypted_data[field], list):
-                encrypted_data[field] = [encryption.encrypt(str(item)) for item in encrypted_data[field]]
+                encrypted_data[field] = encryption.encrypt_many([str(item) for item in encrypted_data[field]])
     return encrypted_data
 
 def decrypt_sensitive_cv_data(encrypted_cv_data: dict) -> dict:
-    encryption = DataEncryption()
-    sensitive_fields = [
-        'name', 'email', 'phone', 'address',
-        'personal_info', 'contact_details'
-    ]
+    encryption = get_default_encryption()
     decrypted_data = encrypted_cv_data.copy()
-    for field in sensitive_fields:
+    for field in SENSITIVE_CV_FIELDS:
         if field in decrypted_data and decrypted_data[field]:
             if isinstance(decrypted_data[field], str):
                 decrypted_data[field] = encryption.decrypt(decrypted_data[field])
             elif isinstance(decrypted_data[field], list):
-                decrypted_data[field] = [encryption.decrypt(str(item)) for item in decrypted_data[field]]
-    return decrypted_data
\ No newline at end of file
+                decrypted_data[field] = encryption.decrypt_many([str(item) for item in decrypted_data[field]])
+    return decrypted_data
+
+def encrypt_csv_columns(input_path: str, output_path: str, columns: List[str],
+                        encryption: Optional[DataEncryption] = None, decrypt: bool = False) -> int:
+    """
+    Enkripsi (atau dekripsi) kolom tertentu sebuah CSV baris per baris,
+    misalnya Resume_str dan Resume_html di data/extracted_cvs.csv. Memori
+    dibatasi per baris, bukan per field: modul csv selalu memuat satu baris
+    utuh, jadi field diproses langsung dengan encrypt/decrypt. Untuk satu
+    nilai yang terlalu besar untuk memori, pakai encrypt_file / encrypt_stream.
+    Mengembalikan jumlah baris yang ditulis.
+    """
+    encryption = encryption or get_default_encryption()
+    transform = encryption.decrypt if decrypt else encryption.encrypt
+    csv.field_size_limit(2 ** 31 - 1)
+    count = 0
+    with open(input_path, newline='', encoding='utf-8') as source, \
+            open(output_path, 'w', newline='', encoding='utf-8') as target:
+        reader = csv.DictReader(source)
+        writer = csv.DictWriter(target, fieldnames=reader.fieldnames)
+        writer.writeheader()
+        for row in reader:
+            for column in columns:
+                if row.get(column):
+                    row[column] = transform(row[column])
+            writer.writerow(row)
+            count += 1
+    return count
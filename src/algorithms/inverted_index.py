@@ -0,0 +1,296 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Pemisah term di buffer kosakata, tidak pernah muncul di dalam term
+TERM_SEPARATOR = "\n"
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    # Varint 7 bit per byte, bit tertinggi menandai masih ada byte berikutnya
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _varint_bytes(value: int) -> bytes:
+    out = bytearray()
+    _encode_varint(value, out)
+    return bytes(out)
+
+# Varint untuk nilai kecil (sampai 2 byte) disiapkan sekali, posisi token jarang lebih besar
+_SMALL_VARINT_LIMIT = 1 << 14
+_SMALL_VARINTS = [_varint_bytes(value) for value in range(_SMALL_VARINT_LIMIT)]
+
+def _decode_varints(blob: bytes, start: int = 0, end: Optional[int] = None) -> List[int]:
+    # Dekode semua varint di blob[start:end]
+    if end is None:
+        end = len(blob)
+    chunk = blob[start:end]
+    if not chunk or max(chunk) < 0x80:
+        # Jalur cepat: semua nilai muat dalam satu byte
+        return list(chunk)
+    values = []
+    value = 0
+    shift = 0
+    for i in range(start, end):
+        byte = blob[i]
+        if byte < 0x80:
+            values.append(value | (byte << shift))
+            value = 0
+            shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    return values
+
+def _count_overlapping(text: str, pattern: str) -> int:
+    # Jumlah kemunculan pattern di text termasuk yang tumpang tindih, sama dengan KMP/BM/AC
+    count = 0
+    position = text.find(pattern)
+    while position != -1:
+        count += 1
+        position = text.find(pattern, position + 1)
+    return count
+
+class _TermPostings:
+    """
+    Postings satu term dalam bentuk terkompresi. docs berisi triple varint
+    (selisih nomor dokumen, tf, panjang byte blok posisi) dan positions
+    berisi selisih posisi token per dokumen, sehingga query tingkat dokumen
+    tidak perlu mendekode posisi sama sekali.
+    """
+    __slots__ = ('docs', 'positions', 'last_doc')
+
+    def __init__(self):
+        self.docs = bytearray()
+        self.positions = bytearray()
+        self.last_doc = 0
+
+    def append(self, doc_no: int, positions: List[int]) -> None:
+        # Posisi pertama absolut, berikutnya selisih dari posisi sebelumnya
+        small = _SMALL_VARINTS
+        out = self.positions
+        start = len(out)
+        previous = 0
+        for position in positions:
+            gap = position - previous
+            out += small[gap] if gap < _SMALL_VARINT_LIMIT else _varint_bytes(gap)
+            previous = position
+        for value in (doc_no - self.last_doc, len(positions), len(out) - start):
+            self.docs += small[value] if value < _SMALL_VARINT_LIMIT else _varint_bytes(value)
+        self.last_doc = doc_no
+
+    def frequencies(self) -> Dict[int, int]:
+        # Nomor dokumen -> tf
+        values = _decode_varints(self.docs)
+        result = {}
+        doc_no = 0
+        for i in range(0, len(values), 3):
+            doc_no += values[i]
+            result[doc_no] = values[i + 1]
+        return result
+
+    def positions_in(self, doc_filter: Optional[set] = None) -> Dict[int, List[int]]:
+        # Nomor dokumen -> posisi token, hanya dokumen di doc_filter kalau diberikan
+        values = _decode_varints(self.docs)
+        result = {}
+        doc_no = 0
+        offset = 0
+        for i in range(0, len(values), 3):
+            doc_no += values[i]
+            size = values[i + 2]
+            if doc_filter is None or doc_no in doc_filter:
+                gaps = _decode_varints(self.positions, offset, offset + size)
+                position = 0
+                positions = []
+                for gap in gaps:
+                    position += gap
+                    positions.append(position)
+                result[doc_no] = positions
+            offset += size
+        return result
+
+class InvertedIndex:
+    """
+    Inverted index posisional atas teks yang sudah dinormalisasi: setiap
+    token dipetakan ke postings terkompresi berisi (dokumen, posisi token).
+    Dokumen diberi nomor urut sesuai urutan add_document.
+
+    count() menjawab pencarian substring dengan hasil yang sama dengan
+    KMP/BM/Aho-Corasick di teks utuh: keyword satu token dicari di kosakata
+    lalu dijumlahkan dari postings, keyword beberapa token (melewati batas
+    token) disaring lewat posisi dan boleh diverifikasi engine string
+    matching pada dokumen kandidat saja.
+    """
+    def __init__(self):
+        self.doc_ids: List[str] = []
+        self._postings: Dict[str, _TermPostings] = {}
+        self._sorted_terms = None
+        self._term_buffer = None
+        self._term_starts = None
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        # Teks normal dipisah spasi tunggal, posisi token = indeks di list ini
+        return text.split(' ')
+
+    def add_document(self, doc_id: str, text: str) -> int:
+        doc_no = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        term_positions = defaultdict(list)
+        for position, token in enumerate(self.tokenize(text)):
+            term_positions[token].append(position)
+        postings = self._postings
+        for term, positions in term_positions.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = _TermPostings()
+            entry.append(doc_no, positions)
+        self._sorted_terms = None
+        self._term_buffer = None
+        self._term_starts = None
+        return doc_no
+
+    def build(self, documents: Iterable[Tuple[str, str]]) -> "InvertedIndex":
+        for doc_id, text in documents:
+            self.add_document(doc_id, text)
+        return self
+
+    def _ensure_terms(self) -> None:
+        # Kosakata terurut (untuk prefix) dan buffer "\nterm\nterm\n" (untuk substring), dibangun sekali
+        if self._sorted_terms is None:
+            terms = sorted(self._postings)
+            starts = []
+            position = 1
+            for term in terms:
+                starts.append(position)
+                position += len(term) + 1
+            self._sorted_terms = terms
+            self._term_buffer = TERM_SEPARATOR + TERM_SEPARATOR.join(terms) + TERM_SEPARATOR
+            self._term_starts = starts
+
+    def _terms_matching(self, fragment: str) -> List[str]:
+        # Term di buffer kosakata yang memuat fragment; fragment berakhiran TERM_SEPARATOR berarti akhiran term
+        self._ensure_terms()
+        buffer = self._term_buffer
+        starts = self._term_starts
+        terms = self._sorted_terms
+        found = []
+        last_index = -1
+        position = buffer.find(fragment)
+        while position != -1:
+            index = bisect_left(starts, position + 1) - 1
+            if index != last_index:
+                found.append(terms[index])
+                last_index = index
+            position = buffer.find(fragment, position + 1)
+        return found
+
+    def prefix_terms(self, prefix: str) -> List[str]:
+        self._ensure_terms()
+        terms = self._sorted_terms
+        result = []
+        index = bisect_left(terms, prefix)
+        while index < len(terms) and terms[index].startswith(prefix):
+            result.append(terms[index])
+            index += 1
+        return result
+
+    def suffix_terms(self, suffix: str) -> List[str]:
+        if not suffix:
+            self._ensure_terms()
+            return list(self._sorted_terms)
+        return self._terms_matching(suffix + TERM_SEPARATOR)
+
+    def substring_terms(self, fragment: str) -> List[str]:
+        if not fragment:
+            self._ensure_terms()
+            return list(self._sorted_terms)
+        return self._terms_matching(fragment)
+
+    def term_counts(self, term: str) -> Dict[int, int]:
+        # Query satu term utuh: nomor dokumen -> tf
+        entry = self._postings.get(term)
+        return entry.frequencies() if entry else {}
+
+    def prefix_counts(self, prefix: str) -> Dict[int, int]:
+        # Query prefix: jumlah token berawalan prefix per dokumen
+        counts = defaultdict(int)
+        for term in self.prefix_terms(prefix):
+            for doc_no, tf in self._postings[term].frequencies().items():
+                counts[doc_no] += tf
+        return dict(counts)
+
+    def _documents_with(self, terms: List[str]) -> set:
+        docs = set()
+        for term in terms:
+            docs.update(self._postings[term].frequencies())
+        return docs
+
+    def _positions_with(self, terms: List[str], docs: set) -> Dict[int, set]:
+        result = defaultdict(set)
+        for term in terms:
+            for doc_no, positions in self._postings[term].positions_in(docs).items():
+                result[doc_no].update(positions)
+        return result
+
+    def phrase_counts(self, parts: List[str]) -> Dict[int, int]:
+        """
+        Query multi-token (parts hasil split keyword per spasi): token pertama
+        harus akhiran sebuah token, token tengah harus sama persis, token
+        terakhir harus awalan token, dan posisinya berurutan. Mengembalikan
+        jumlah kemunculan per dokumen.
+        """
+        slots = [self.suffix_terms(parts[0])]
+        slots.extend([part] if part in self._postings else [] for part in parts[1:-1])
+        slots.append(self.prefix_terms(parts[-1]))
+        if any(not terms for terms in slots):
+            return {}
+        # Irisan dokumen dimulai dari slot dengan term paling sedikit
+        candidates = None
+        for terms in sorted(slots, key=len):
+            docs = self._documents_with(terms)
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return {}
+        slot_positions = [self._positions_with(terms, candidates) for terms in slots]
+        counts = {}
+        for doc_no in candidates:
+            per_slot = [positions[doc_no] for positions in slot_positions]
+            count = 0
+            for start in per_slot[0]:
+                if all(start + offset in per_slot[offset] for offset in range(1, len(per_slot))):
+                    count += 1
+            if count:
+                counts[doc_no] = count
+        return counts
+
+    def count(self, keyword: str, verify: Optional[Callable[[int, str], int]] = None) -> Dict[int, int]:
+        """
+        Jumlah kemunculan substring keyword (sudah dinormalisasi) per nomor
+        dokumen. Kalau verify diberikan, match yang melewati batas token
+        dihitung ulang dengan verify(nomor dokumen, keyword) hanya pada
+        dokumen kandidat hasil postings.
+        """
+        if not keyword:
+            return {}
+        parts = keyword.split(' ')
+        if len(parts) > 1:
+            counts = self.phrase_counts(parts)
+            if verify is None:
+                return counts
+            verified = {}
+            for doc_no in counts:
+                count = verify(doc_no, keyword)
+                if count:
+                    verified[doc_no] = count
+            return verified
+        counts = defaultdict(int)
+        for term in self.substring_terms(keyword):
+            occurrences = _count_overlapping(term, keyword)
+            for doc_no, tf in self._postings[term].frequencies().items():
+                counts[doc_no] += occurrences * tf
+        return dict(counts)
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
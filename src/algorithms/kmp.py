@@ -1,73 +1,122 @@
-from typing import List
+from typing import List, Optional, Union
+from array import array
 
-class KMPSearch:
-    def __init__(self):
-        pass
+from .text_normalizer import NormalizedText, normalize_query
 
-    def compute_lps_array(self, pattern: str) -> List[int]:
-        # LPS array
-        m = len(pattern)
-        lps = [0] * m
-        length = 0
-        i = 1
-        while i < m:
-            if pattern[i] == pattern[length]:
-                length += 1
-                lps[i] = length
-                i += 1
+def _compute_lps(pattern: str) -> List[int]:
+    # LPS array
+    m = len(pattern)
+    lps = [0] * m
+    length = 0
+    i = 1
+    while i < m:
+        if pattern[i] == pattern[length]:
+            length += 1
+            lps[i] = length
+            i += 1
+        else:
+            if length != 0:
+                length = lps[length - 1]
             else:
-                if length != 0:
-                    length = lps[length - 1]
-                else:
-                    lps[i] = 0
-                    i += 1
-        return lps
+                lps[i] = 0
+                i += 1
+    return lps
 
-    def search(self, text: str, pattern: str) -> int:
-        # Cari kemunculan pertama pattern dalam teks
+class KMPPattern:
+    # Pattern yang sudah dikompilasi (LPS array), immutable dan aman dipakai bersama
+    __slots__ = ('pattern', 'lps')
+
+    def __init__(self, pattern: str):
+        object.__setattr__(self, 'pattern', pattern)
+        object.__setattr__(self, 'lps', array('i', _compute_lps(pattern)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KMPPattern is immutable")
+
+    def _scan(self, text: str, limit: Optional[int], positions: Optional[List[int]]) -> int:
+        # Loop KMP bersama: hitung match, simpan posisi kalau positions diberikan
+        pattern = self.pattern
         if not pattern or not text:
-            return -1
+            return 0
+        lps = self.lps
         n = len(text)
         m = len(pattern)
-        lps = self.compute_lps_array(pattern)
+        found = 0
         i = j = 0
         while i < n:
             if pattern[j] == text[i]:
                 i += 1
                 j += 1
             if j == m:
-                return i - j
+                found += 1
+                if positions is not None:
+                    positions.append(i - j)
+                if limit is not None and found >= limit:
+                    return found
+                j = lps[j - 1]
             elif i < n and pattern[j] != text[i]:
-                j = lps[j - 1] if j != 0 else 0
-                if j == 0:
+                if j != 0:
+                    j = lps[j - 1]
+                else:
                     i += 1
-        return -1
+        return found
 
-    def search_all(self, text: str, pattern: str) -> List[int]:
+    def search(self, text: str) -> int:
+        # Cari kemunculan pertama pattern dalam teks
+        positions = []
+        self._scan(text, 1, positions)
+        return positions[0] if positions else -1
+
+    def search_all(self, text: str) -> List[int]:
         # Cari semua kemunculan pattern
-        if not pattern or not text:
-            return []
         positions = []
-        n = len(text)
-        m = len(pattern)
-        lps = self.compute_lps_array(pattern)
-        i = j = 0
-        while i < n:
-            if pattern[j] == text[i]:
-                i += 1
-                j += 1
-            if j == m:
-                positions.append(i - j)
-                j = lps[j - 1]
-            elif i < n and pattern[j] != text[i]:
-                j = lps[j - 1] if j != 0 else 0
-                if j == 0:
-                    i += 1
+        self._scan(text, None, positions)
         return positions
 
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        # Hitung kemunculan tanpa menyimpan posisi, berhenti kalau sudah mencapai limit
+        return self._scan(text, limit, None)
+
+    def contains(self, text: str) -> bool:
+        # Cek keberadaan pattern, berhenti di kemunculan pertama
+        return self._scan(text, 1, None) > 0
+
+class KMPSearch:
+    def __init__(self):
+        pass
+
+    def compute_lps_array(self, pattern: str) -> List[int]:
+        # LPS array
+        return _compute_lps(pattern)
+
+    def compile(self, pattern: str) -> KMPPattern:
+        # Kompilasi pattern sekali, lalu pakai ulang untuk banyak teks
+        return KMPPattern(pattern)
+
+    def search(self, text: str, pattern: str) -> int:
+        # Cari kemunculan pertama pattern dalam teks
+        return self.compile(pattern).search(text)
+
+    def search_all(self, text: str, pattern: str) -> List[int]:
+        # Cari semua kemunculan pattern
+        return self.compile(pattern).search_all(text)
+
+    def count(self, text: str, pattern: str, limit: Optional[int] = None) -> int:
+        # Hitung kemunculan tanpa menyimpan posisi, berhenti kalau sudah mencapai limit
+        return self.compile(pattern).count(text, limit)
+
+    def contains(self, text: str, pattern: str) -> bool:
+        # Cek keberadaan pattern, berhenti di kemunculan pertama
+        return self.compile(pattern).contains(text)
+
     def count_occurrences(self, text: str, pattern: str) -> int:
         # Menghitung jumlah kemunculan pattern
-        return len(self.search_all(text, pattern))
+        return self.count(text, pattern)
 
-    def search_case_insensitive(self, text: str, pattern: str) -> List[int]:
-        return self.search_all(text.lower(), pattern.lower())
\ No newline at end of file
+    def search_case_insensitive(self, text: Union[str, NormalizedText], pattern: str) -> List[int]:
+        # NormalizedText dari tahap load dipakai langsung tanpa salinan lowercase,
+        # posisi hasilnya dipetakan kembali ke teks asli
+        if isinstance(text, NormalizedText):
+            positions = self.search_all(text.text, normalize_query(pattern))
+            return [text.original_position(pos) for pos in positions]
+        return self.search_all(text.lower(), pattern.lower())
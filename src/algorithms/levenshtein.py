@@ -1,9 +1,177 @@
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Sequence
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional, batch API jatuh ke MyersPattern per kata
+    np = None
+
+# Lebar bucket panjang kata untuk batch numpy: kata dalam satu bucket dipad ke panjang yang sama
+BATCH_BUCKET_WIDTH = 4
+
+def max_distance_for_similarity(length: int, threshold: float) -> int:
+    # Jarak edit terbesar d yang masih memenuhi 1 - d / length >= threshold
+    # (-1 kalau threshold tidak mungkin dipenuhi)
+    if length <= 0:
+        return 0 if threshold <= 1.0 else -1
+    d = max(0, int((1.0 - threshold) * length))
+    while d < length and 1.0 - (d + 1) / length >= threshold:
+        d += 1
+    while d >= 0 and 1.0 - d / length < threshold:
+        d -= 1
+    return d
+
+def search_tolerance(length: int, threshold: float) -> Optional[int]:
+    # Jarak edit terbesar yang mungkin masih lolos threshold untuk kata apa pun:
+    # kata sepanjang n hanya lolos kalau |n - length| <= d <= batas jarak max(length, n).
+    # None kalau threshold <= 0 (semua kata lolos, tidak ada batas)
+    if threshold <= 0.0:
+        return None
+    tolerance = max_distance_for_similarity(length, threshold)
+    n = length + 1
+    while n - length <= max_distance_for_similarity(n, threshold):
+        tolerance = max(tolerance, max_distance_for_similarity(n, threshold))
+        n += 1
+    return tolerance
+
+class MyersPattern:
+    """
+    Levenshtein bit-vector Myers (1999) untuk satu keyword. Bitmask peq per
+    karakter dibangun sekali saat kompilasi, lalu tiap kata kandidat cukup
+    diproses dengan beberapa operasi integer per karakter (O(n) untuk
+    keyword <= 64 karakter). Keyword yang lebih panjang memakai recurrence
+    yang sama di atas int Python yang lebih lebar, sehingga tidak perlu
+    dipecah per blok 64 bit secara manual.
+    """
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.length = len(pattern)
+        self.full_mask = (1 << self.length) - 1
+        self.top_bit = 1 << (self.length - 1) if pattern else 0
+        peq = {}
+        for i, char in enumerate(pattern):
+            peq[char] = peq.get(char, 0) | (1 << i)
+        self.peq = peq
+
+    def distance_bounded(self, text: str, max_dist: Optional[int] = None) -> int:
+        # Jarak edit global pattern vs text; kalau max_dist diisi, hasil di atas
+        # batas dilaporkan sebagai max_dist + 1 dan pemrosesan berhenti lebih awal
+        m = self.length
+        n = len(text)
+        if max_dist is not None and abs(m - n) > max_dist:
+            return max_dist + 1
+        if not m:
+            return n
+        peq = self.peq
+        full = self.full_mask
+        top = self.top_bit
+        pv = full
+        mv = 0
+        score = m
+        remaining = n
+        for char in text:
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & full)
+            mh = pv & xh
+            if ph & top:
+                score += 1
+            elif mh & top:
+                score -= 1
+            ph = ((ph << 1) | 1) & full
+            mh = (mh << 1) & full
+            pv = mh | (~(xv | ph) & full)
+            mv = ph & xv
+            remaining -= 1
+            # Skor hanya bisa turun satu per karakter sisa
+            if max_dist is not None and score - remaining > max_dist:
+                return max_dist + 1
+        return score
+
+    def distance(self, text: str) -> int:
+        return self.distance_bounded(text)
+
+    def similarity(self, text: str, threshold: Optional[float] = None) -> float:
+        if not self.pattern and not text:
+            return 1.0
+        max_len = max(self.length, len(text), 1)
+        if threshold is None:
+            return 1.0 - (self.distance_bounded(text) / max_len)
+        max_dist = max_distance_for_similarity(max_len, threshold)
+        if max_dist < 0:
+            return 0.0
+        return 1.0 - (self.distance_bounded(text, max_dist) / max_len)
+
+class PackedCandidates:
+    """
+    Daftar kandidat yang sudah dikemas untuk batch numpy: dikelompokkan per
+    bucket panjang, lalu tiap bucket dipad menjadi satu array code point.
+    Dikemas sekali (misalnya kosakata korpus) lalu dipakai untuk banyak keyword.
+    """
+    def __init__(self, candidates: Sequence[str]):
+        self.candidates = list(candidates)
+        self.buckets = []
+        if np is None:
+            return
+        groups = defaultdict(list)
+        for index, word in enumerate(self.candidates):
+            groups[len(word) // BATCH_BUCKET_WIDTH].append(index)
+        for key in sorted(groups):
+            indices = groups[key]
+            words = [self.candidates[i] for i in indices]
+            lengths = np.array([len(word) for word in words], dtype=np.int64)
+            width = int(lengths.max())
+            # Padding di kanan tidak memengaruhi kolom <= panjang kata (DP hanya mengalir ke kanan)
+            buffer = ''.join(word.ljust(width, '\x00') for word in words)
+            codes = np.frombuffer(buffer.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).reshape(len(words), width)
+            # Disimpan per kolom (posisi karakter x kandidat) supaya cummin berjalan di baris yang kontigu
+            self.buckets.append((np.array(indices, dtype=np.int64), lengths, np.ascontiguousarray(codes.T), int(lengths.min())))
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+def _numpy_distance_batch(pattern: str, packed: PackedCandidates, max_dist: Optional[int] = None) -> "np.ndarray":
+    # DP Levenshtein untuk semua kandidat sekaligus, satu baris pattern per iterasi.
+    # Suku insert new[j] = min(a[j], new[j-1] + 1) diselesaikan tanpa loop kolom:
+    # new[j] = j + cummin(a[l] - l), sehingga satu baris cukup beberapa operasi array
+    m = len(pattern)
+    distances = np.empty(len(packed), dtype=np.int32)
+    if max_dist is not None:
+        distances.fill(max_dist + 1)
+    pattern_codes = [ord(char) for char in pattern]
+    for indices, lengths, codes, min_length in packed.buckets:
+        width, count = codes.shape
+        # Bucket yang selisih panjangnya pasti melewati max_dist dilewati
+        if max_dist is not None and (min_length - m > max_dist or m - width > max_dist):
+            continue
+        if width == 0:
+            distances[indices] = m
+            continue
+        dtype = np.int16 if width + m < 32000 else np.int32
+        offsets = np.arange(width + 1, dtype=dtype)[:, None]
+        prev = np.repeat(offsets, count, axis=1)
+        row = np.empty_like(prev)
+        for i, code in enumerate(pattern_codes, 1):
+            row[0] = i
+            np.minimum(prev[:-1] + (codes != code), prev[1:] + 1, out=row[1:])
+            row -= offsets
+            np.minimum.accumulate(row, axis=0, out=row)
+            row += offsets
+            prev, row = row, prev
+        distances[indices] = prev[lengths, np.arange(count)]
+    if max_dist is not None:
+        np.minimum(distances, max_dist + 1, out=distances)
+    return distances
 
 class LevenshteinDistance:
     def __init__(self):
         pass
 
+    def compile(self, pattern: str) -> MyersPattern:
+        # Kompilasi keyword sekali untuk dibandingkan dengan banyak kata
+        return MyersPattern(pattern)
+
     def distance(self, str1: str, str2: str) -> int:
         if not str1:
             return len(str2)
@@ -32,17 +200,97 @@ class LevenshteinDistance:
                     )
         return dp[m][n]
 
-    def similarity(self, str1: str, str2: str) -> float:
+    def pack(self, candidates: Sequence[str]) -> PackedCandidates:
+        # Kemas kandidat sekali untuk dipakai ulang oleh distance_batch
+        return PackedCandidates(candidates)
+
+    def distance_batch(self, pattern: str, candidates, max_dist: Optional[int] = None) -> List[int]:
+        # Jarak edit pattern ke banyak kandidat sekaligus (numpy kalau tersedia).
+        # candidates boleh berupa list kata atau PackedCandidates hasil pack().
+        # Dengan max_dist, hasil exact kalau <= max_dist, selain itu max_dist + 1
+        words = candidates.candidates if isinstance(candidates, PackedCandidates) else candidates
+        if np is None or not pattern or not words:
+            compiled = self.compile(pattern)
+            return [compiled.distance_bounded(candidate, max_dist) for candidate in words]
+        if not isinstance(candidates, PackedCandidates):
+            candidates = PackedCandidates(words)
+        return _numpy_distance_batch(pattern, candidates, max_dist).tolist()
+
+    def similarity_batch(self, pattern: str, candidates) -> List[float]:
+        # Similarity pattern ke banyak kandidat, sama dengan similarity() per kandidat
+        words = candidates.candidates if isinstance(candidates, PackedCandidates) else candidates
+        similarities = []
+        for candidate, d in zip(words, self.distance_batch(pattern, candidates)):
+            if not pattern and not candidate:
+                similarities.append(1.0)
+            else:
+                similarities.append(1.0 - d / max(len(pattern), len(candidate), 1))
+        return similarities
+
+    def distance_bounded(self, str1: str, str2: str, max_dist: int) -> int:
+        # Jarak edit dengan batas: hasil exact kalau <= max_dist, selain itu max_dist + 1.
+        # Hanya dua baris DP yang disimpan dan hanya pita diagonal |i - j| <= max_dist
+        # yang dihitung (Ukkonen), berhenti lebih awal kalau minimum pita melewati batas
+        m, n = len(str1), len(str2)
+        limit = max_dist + 1
+        if max_dist < 0:
+            # Jarak tidak pernah negatif, jadi selalu di atas batas (sama dengan MyersPattern)
+            return limit
+        if abs(m - n) > max_dist:
+            return limit
+        if not str1:
+            return n
+        if not str2:
+            return m
+
+        prev = [j if j <= max_dist else limit for j in range(n + 1)]
+        curr = [limit] * (n + 1)
+        for i in range(1, m + 1):
+            lo = max(1, i - max_dist)
+            hi = min(n, i + max_dist)
+            curr[0] = i if i <= max_dist else limit
+            if lo > 1:
+                curr[lo - 1] = limit
+            if hi < n:
+                curr[hi + 1] = limit
+            char1 = str1[i - 1]
+            left = curr[lo - 1]
+            row_min = left
+            for j in range(lo, hi + 1):
+                value = prev[j - 1] if char1 == str2[j - 1] else prev[j - 1] + 1
+                if prev[j] + 1 < value:
+                    value = prev[j] + 1
+                if left + 1 < value:
+                    value = left + 1
+                if value > limit:
+                    value = limit
+                curr[j] = value
+                left = value
+                if value < row_min:
+                    row_min = value
+            if row_min > max_dist:
+                return limit
+            prev, curr = curr, prev
+        return prev[n] if prev[n] <= max_dist else limit
+
+    def similarity(self, str1: str, str2: str, threshold: Optional[float] = None) -> float:
+        # Kalau threshold diberikan, dipakai distance_bounded: nilai exact saat
+        # similarity >= threshold, selain itu cukup dijamin di bawah threshold
         if not str1 and not str2:
             return 1.0
         max_len = max(len(str1), len(str2), 1)
-        return 1.0 - (self.distance(str1, str2) / max_len)
+        if threshold is None:
+            return 1.0 - (self.distance(str1, str2) / max_len)
+        max_dist = max_distance_for_similarity(max_len, threshold)
+        if max_dist < 0:
+            return 0.0
+        return 1.0 - (self.distance_bounded(str1, str2, max_dist) / max_len)
 
     def similarity_percentage(self, str1: str, str2: str) -> float:
         return self.similarity(str1, str2) * 100.0
 
     def is_similar(self, str1: str, str2: str, threshold: float = 0.8) -> bool:
-        return self.similarity(str1, str2) >= threshold
+        return self.similarity(str1, str2, threshold) >= threshold
 
     def find_closest_match(self, target: str, candidates: List[str]) -> Tuple[str, float]:
         if not candidates:
@@ -50,8 +298,7 @@ class LevenshteinDistance:
 
         best_match = ""
         best_similarity = 0.0
-        for candidate in candidates:
-            sim = self.similarity(target, candidate)
+        for candidate, sim in zip(candidates, self.similarity_batch(target, candidates)):
             if sim > best_similarity:
                 best_similarity = sim
                 best_match = candidate
@@ -60,8 +307,14 @@ class LevenshteinDistance:
     def find_all_similar(self, target: str, candidates: List[str], threshold: float = 0.7) -> List[Tuple[str, float]]:
         # Ambil semua kandidat dengan similarity >= threshold
         result = []
-        for candidate in candidates:
-            sim = self.similarity(target, candidate)
+        tolerance = search_tolerance(len(target), threshold)
+        for candidate, d in zip(candidates, self.distance_batch(target, candidates, tolerance)):
+            if tolerance is not None and d > tolerance:
+                continue
+            if not target and not candidate:
+                sim = 1.0
+            else:
+                sim = 1.0 - d / max(len(target), len(candidate), 1)
             if sim >= threshold:
                 result.append((candidate, sim))
         result.sort(key=lambda x: x[1], reverse=True)
@@ -0,0 +1,141 @@
+from typing import List, Dict, Tuple, Iterable, Iterator
+
+# Batas toleransi automaton: jumlah state DFA tumbuh cepat untuk k yang lebih besar
+MAX_AUTOMATON_DISTANCE = 2
+
+# State mati: semua nilai baris DP sudah melewati k, tidak ada kelanjutan yang bisa diterima
+DEAD_STATE = -1
+
+class LevenshteinAutomaton:
+    """
+    DFA Levenshtein untuk satu keyword dan toleransi k (k <= 2). State DFA
+    adalah baris DP Levenshtein dengan nilai dipotong di k + 1, sehingga
+    jumlahnya terbatas. Alfabet cukup karakter keyword ditambah satu kelas
+    "karakter lain", jadi seluruh DFA dibangun eager saat kompilasi.
+    """
+    def __init__(self, pattern: str, max_dist: int):
+        if not 0 <= max_dist <= MAX_AUTOMATON_DISTANCE:
+            raise ValueError(f"max_dist must be between 0 and {MAX_AUTOMATON_DISTANCE}")
+        self.pattern = pattern
+        self.max_dist = max_dist
+        self.alphabet = sorted(set(pattern))
+        # transitions[state][char] -> state, other[state] untuk karakter di luar keyword
+        self.transitions: List[Dict[str, int]] = []
+        self.other: List[int] = []
+        # Jarak ke keyword kalau input berhenti di state ini (> k berarti tidak diterima)
+        self.distance: List[int] = []
+        self._build()
+
+    def _step(self, row: Tuple[int, ...], char) -> Tuple[int, ...]:
+        # Satu baris DP berikutnya; char None berarti karakter yang tidak ada di keyword
+        pattern = self.pattern
+        cap = self.max_dist + 1
+        new_row = [min(row[0] + 1, cap)]
+        for i in range(1, len(row)):
+            cost = 0 if pattern[i - 1] == char else 1
+            value = min(row[i - 1] + cost, row[i] + 1, new_row[i - 1] + 1)
+            new_row.append(value if value < cap else cap)
+        return tuple(new_row)
+
+    def _build(self) -> None:
+        cap = self.max_dist + 1
+        start = tuple(min(i, cap) for i in range(len(self.pattern) + 1))
+        state_ids = {start: 0}
+        rows = [start]
+        index = 0
+        while index < len(rows):
+            row = rows[index]
+            transitions = {}
+            targets = []
+            for char in self.alphabet + [None]:
+                next_row = self._step(row, char)
+                if min(next_row) >= cap:
+                    target = DEAD_STATE
+                else:
+                    target = state_ids.get(next_row)
+                    if target is None:
+                        target = len(rows)
+                        state_ids[next_row] = target
+                        rows.append(next_row)
+                targets.append(target)
+            for char, target in zip(self.alphabet, targets):
+                transitions[char] = target
+            self.transitions.append(transitions)
+            self.other.append(targets[-1])
+            self.distance.append(row[-1])
+            index += 1
+
+    def step(self, state: int, char: str) -> int:
+        return self.transitions[state].get(char, self.other[state])
+
+    def match_distance(self, word: str) -> int:
+        # Jarak edit ke keyword kalau <= k, selain itu k + 1
+        state = 0
+        for char in word:
+            state = self.step(state, char)
+            if state == DEAD_STATE:
+                return self.max_dist + 1
+        return self.distance[state]
+
+    def __len__(self) -> int:
+        return len(self.transitions)
+
+class VocabularyTrieNode:
+    __slots__ = ('children', 'word')
+
+    def __init__(self):
+        self.children = {}
+        self.word = None
+
+class VocabularyTrie:
+    """
+    Trie kosakata korpus. Pencarian fuzzy menelusuri trie bersamaan dengan
+    DFA Levenshtein: begitu state DFA mati, seluruh subtree dipangkas.
+    """
+    def __init__(self, words: Iterable[str] = ()):
+        self.root = VocabularyTrieNode()
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        node = self.root
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = VocabularyTrieNode()
+            node = child
+        if node.word is None:
+            node.word = word
+            self.size += 1
+
+    def iter_fuzzy(self, automaton: LevenshteinAutomaton) -> Iterator[Tuple[str, int]]:
+        # DFS trie x DFA, hasilkan (kata, jarak) untuk setiap kata yang diterima
+        transitions = automaton.transitions
+        other = automaton.other
+        distance = automaton.distance
+        max_dist = automaton.max_dist
+        if self.root.word is not None and distance[0] <= max_dist:
+            yield self.root.word, distance[0]
+        stack = [(self.root, 0)]
+        while stack:
+            node, state = stack.pop()
+            state_transitions = transitions[state]
+            state_other = other[state]
+            for char, child in node.children.items():
+                next_state = state_transitions.get(char, state_other)
+                if next_state == DEAD_STATE:
+                    continue
+                if child.word is not None and distance[next_state] <= max_dist:
+                    yield child.word, distance[next_state]
+                if child.children:
+                    stack.append((child, next_state))
+
+    def search(self, query: str, max_dist: int) -> List[Tuple[str, int]]:
+        # Semua kata dengan jarak edit <= max_dist dari query
+        results = list(self.iter_fuzzy(LevenshteinAutomaton(query, max_dist)))
+        results.sort(key=lambda x: (x[1], x[0]))
+        return results
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,195 @@
+import atexit
+import multiprocessing
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .kmp import KMPSearch
+from .bm import BoyerMooreSearch
+from .aho_corasick import AhoCorasickSearch
+from .wu_manber import WuManberSearch
+from .bitap import BitapSearch
+from .levenshtein import LevenshteinDistance, max_distance_for_similarity
+
+# Jumlah potongan per worker: potongan kecil menyeimbangkan beban kalau panjang dokumen bervariasi
+SHARDS_PER_WORKER = 4
+
+# State di setiap proses worker, diisi sekali oleh _init_worker
+_worker = {}
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    # Segmen milik parent; worker spawn berbagi resource tracker dengan parent,
+    # jadi cukup parent yang melakukan unlink saat close
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 belum punya parameter track
+        return shared_memory.SharedMemory(name=name)
+
+def _init_worker(shm_name: str, offsets: bytes) -> None:
+    _worker['shm'] = _attach_shared_memory(shm_name)
+    _worker['offsets'] = array('q', offsets)
+    _worker['kmp'] = KMPSearch()
+    _worker['bm'] = BoyerMooreSearch(variant="auto")
+    _worker['ac'] = AhoCorasickSearch()
+    _worker['wm'] = WuManberSearch()
+    _worker['bitap'] = BitapSearch()
+    _worker['levenshtein'] = LevenshteinDistance()
+
+def _worker_text(doc_no: int) -> str:
+    # Teks dokumen didekode langsung dari shared memory setiap task dan tidak disimpan,
+    # supaya worker tidak menyimpan salinan korpus sendiri
+    offsets = _worker['offsets']
+    return str(_worker['shm'].buf[offsets[doc_no]:offsets[doc_no + 1]], 'utf-8')
+
+def _exact_task(args: Tuple[List[int], Tuple[str, ...], str]) -> List[Dict[str, int]]:
+    # Hitungan exact per dokumen di satu potongan, aturan sama dengan perform_exact_search
+    doc_nos, keywords, algorithm = args
+    results = []
+    if algorithm in ("AC", "BM") and len(keywords) > 1:
+        engine = _worker['wm'] if algorithm == "BM" else _worker['ac']
+        matcher = engine.compile(list(keywords))
+        for doc_no in doc_nos:
+            counts = matcher.count(_worker_text(doc_no))
+            results.append({kw: counts[kw] for kw in keywords if counts.get(kw, 0) > 0})
+        return results
+    unique_keywords = list(dict.fromkeys(keywords))
+    if algorithm in ("KMP", "BM"):
+        engine = _worker['kmp'] if algorithm == "KMP" else _worker['bm']
+        compiled = [(kw, engine.compile(kw).count) for kw in unique_keywords]
+    elif algorithm == "AC":
+        ac = _worker['ac']
+        compiled = [(kw, lambda text, kw=kw: ac.count(text, kw)) for kw in unique_keywords]
+    else:
+        compiled = [(kw, lambda text, kw=kw: text.count(kw)) for kw in unique_keywords]
+    for doc_no in doc_nos:
+        text = _worker_text(doc_no)
+        counts = {}
+        for kw, count_fn in compiled:
+            count = count_fn(text)
+            if count > 0:
+                counts[kw] = count
+        results.append(counts)
+    return results
+
+def _fuzzy_task(args: Tuple[List[int], Tuple[str, ...], str, float]) -> List[Dict[str, int]]:
+    # Hitungan fuzzy per dokumen di satu potongan, aturan sama dengan perform_fuzzy_search
+    doc_nos, keywords, engine, threshold = args
+    unique_keywords = list(dict.fromkeys(keywords))
+    bitap = _worker['bitap']
+    compiled = {kw: _worker['levenshtein'].compile(kw) for kw in unique_keywords}
+    results = []
+    for doc_no in doc_nos:
+        text = _worker_text(doc_no)
+        unique_words = None
+        counts = {}
+        for kw in unique_keywords:
+            count = 0
+            if engine == "bitap":
+                max_errors = max_distance_for_similarity(len(kw), threshold)
+                if max_errors > 0:
+                    count = bitap.count_approximate(text, kw, max_errors)
+            else:
+                if unique_words is None:
+                    unique_words = set(text.split())
+                compiled_kw = compiled[kw]
+                for word in unique_words:
+                    if len(word) > 2 and compiled_kw.similarity(word, threshold) >= threshold:
+                        count += 1
+            if count > 0:
+                counts[kw] = count
+        results.append(counts)
+    return results
+
+def _split_documents(doc_nos: Sequence[int], offsets: array, parts: int) -> List[List[int]]:
+    # Bagi dokumen menjadi potongan berurutan dengan total byte yang kira-kira sama
+    total = sum(offsets[doc_no + 1] - offsets[doc_no] for doc_no in doc_nos)
+    target = max(1, total // max(parts, 1))
+    shards = []
+    current = []
+    size = 0
+    for doc_no in doc_nos:
+        current.append(doc_no)
+        size += offsets[doc_no + 1] - offsets[doc_no]
+        if size >= target:
+            shards.append(current)
+            current = []
+            size = 0
+    if current:
+        shards.append(current)
+    return shards
+
+class ParallelSearchExecutor:
+    """
+    Pencarian exact dan fuzzy (bitap / levenshtein per kata) multi-proses atas
+    korpus yang sudah dinormalisasi. Exact dipakai saat inverted index tidak
+    tersedia (dimatikan atau gagal dibangun). Seluruh teks disalin sekali ke
+    multiprocessing.shared_memory, lalu pool worker persisten mengerjakan
+    potongan dokumen. Worker mendekode potongannya dari shared memory per
+    task tanpa menyimpan salinan, jadi korpus hanya ada sekali di memori.
+    Hasil per dokumen digabung sesuai urutan dokumen, sama dengan jalur serial.
+    """
+    def __init__(self, texts: Sequence[str], workers: Optional[int] = None,
+                 shards_per_worker: int = SHARDS_PER_WORKER):
+        self.workers = max(1, workers or multiprocessing.cpu_count())
+        self.shards_per_worker = shards_per_worker
+        encoded = [text.encode('utf-8') for text in texts]
+        offsets = array('q', [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        self.offsets = offsets
+        self.document_count = len(encoded)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offsets[-1], 1))
+        try:
+            self.shm.buf[:offsets[-1]] = b"".join(encoded)
+            # spawn: aman walaupun proses utama punya thread lain (UI)
+            context = multiprocessing.get_context("spawn")
+            self.pool = context.Pool(self.workers, initializer=_init_worker,
+                                     initargs=(self.shm.name, offsets.tobytes()))
+        except Exception:
+            # Segmen di /dev/shm tidak boleh tertinggal kalau pool gagal dibuat
+            self.shm.close()
+            self.shm.unlink()
+            raise
+        self.shards = _split_documents(range(self.document_count), offsets, self.workers * shards_per_worker)
+        self._closed = False
+        atexit.register(self.close)
+
+    def exact_counts(self, keywords: Sequence[str], algorithm: str) -> List[Dict[str, int]]:
+        # Hitungan keyword (sudah dinormalisasi) per dokumen, urut sesuai dokumen
+        keywords = tuple(keywords)
+        tasks = [(shard, keywords, algorithm) for shard in self.shards]
+        results = []
+        for shard_results in self.pool.map(_exact_task, tasks):
+            results.extend(shard_results)
+        return results
+
+    def fuzzy_counts(self, keywords: Sequence[str], engine: str, threshold: float,
+                     doc_nos: Optional[Sequence[int]] = None) -> Dict[int, Dict[str, int]]:
+        # Hitungan fuzzy per dokumen, hanya untuk doc_nos kalau diberikan (misalnya yang tidak punya match exact)
+        keywords = tuple(keywords)
+        if doc_nos is None:
+            shards = self.shards
+        else:
+            shards = _split_documents(list(doc_nos), self.offsets, self.workers * self.shards_per_worker)
+        tasks = [(shard, keywords, engine, threshold) for shard in shards]
+        results = {}
+        for shard, shard_results in zip(shards, self.pool.map(_fuzzy_task, tasks)):
+            results.update(zip(shard, shard_results))
+        return results
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self.pool.terminate()
+        self.pool.join()
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return self.document_count
@@ -0,0 +1,204 @@
+import os
+import sys
+import json
+import struct
+from array import array
+from typing import Dict, List, Set, Tuple, Iterable, Optional
+
+from .levenshtein import LevenshteinDistance
+
+# Versi format file index, dinaikkan kalau struktur file berubah
+INDEX_FORMAT_VERSION = 2
+
+# Pemisah kata dan varian hapus di file index, tidak pernah muncul di dalam kata
+WORD_SEPARATOR = "\n"
+
+class SymSpellIndex:
+    """
+    Index symmetric delete (SymSpell). Setiap kata kosakata disimpan di
+    bawah semua variannya setelah dihapus sampai max_distance karakter.
+    Query cukup membangkitkan varian hapus miliknya sendiri, mengambil
+    kandidat lewat lookup dict, lalu memverifikasi jarak edit sebenarnya.
+
+    prefix_length membatasi varian hapus ke prefix kata: memori jauh lebih
+    kecil, tapi kata yang salah ketiknya di awal bisa terlewat.
+    max_entries membatasi jumlah pasangan (varian, kata); kata yang tidak
+    muat dilewati dan truncated diset True.
+    """
+    def __init__(self, max_distance: int = 2, prefix_length: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        if max_distance < 0:
+            raise ValueError("max_distance must be >= 0")
+        if prefix_length is not None and prefix_length <= max_distance:
+            raise ValueError("prefix_length must be greater than max_distance")
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.max_entries = max_entries
+        self.deletes: Dict[str, List[str]] = {}
+        self.words: Set[str] = set()
+        self.entry_count = 0
+        self.truncated = False
+        # Sidik jari kosakata sumber, dipakai untuk mengecek index di disk masih berlaku
+        self.fingerprint = None
+        self.levenshtein = LevenshteinDistance()
+
+    def _key(self, word: str) -> str:
+        return word[:self.prefix_length] if self.prefix_length else word
+
+    @staticmethod
+    def _delete_variants(key: str, distance: int) -> Set[str]:
+        # Semua string hasil menghapus 0..distance karakter dari key
+        variants = {key}
+        frontier = {key}
+        for _ in range(distance):
+            next_frontier = set()
+            for item in frontier:
+                if not item:
+                    continue
+                for i in range(len(item)):
+                    next_frontier.add(item[:i] + item[i + 1:])
+            next_frontier -= variants
+            variants |= next_frontier
+            frontier = next_frontier
+        return variants
+
+    def add(self, word: str) -> bool:
+        # Tambahkan kata, False kalau kata dilewati karena batas memori
+        if not word or word in self.words:
+            return True
+        variants = self._delete_variants(self._key(word), self.max_distance)
+        if self.max_entries is not None and self.entry_count + len(variants) > self.max_entries:
+            self.truncated = True
+            return False
+        deletes = self.deletes
+        for variant in variants:
+            bucket = deletes.get(variant)
+            if bucket is None:
+                deletes[variant] = [word]
+            else:
+                bucket.append(word)
+        self.entry_count += len(variants)
+        self.words.add(word)
+        return True
+
+    def build(self, words: Iterable[str]) -> "SymSpellIndex":
+        # Kata sebaiknya diurutkan dari yang paling penting, supaya yang
+        # terlewat saat batas memori tercapai adalah kata yang jarang
+        for word in words:
+            self.add(word)
+        return self
+
+    def lookup(self, query: str, max_dist: Optional[int] = None) -> List[Tuple[str, int]]:
+        # Kata index dengan jarak edit <= max_dist (dibatasi max_distance index)
+        if max_dist is None or max_dist > self.max_distance:
+            max_dist = self.max_distance
+        if not query or max_dist < 0:
+            return []
+        candidates = set()
+        deletes = self.deletes
+        for variant in self._delete_variants(self._key(query), max_dist):
+            bucket = deletes.get(variant)
+            if bucket:
+                candidates.update(bucket)
+        compiled = self.levenshtein.compile(query)
+        length = len(query)
+        results = []
+        for word in candidates:
+            if abs(len(word) - length) > max_dist:
+                continue
+            d = compiled.distance_bounded(word, max_dist)
+            if d <= max_dist:
+                results.append((word, d))
+        results.sort(key=lambda x: (x[1], x[0]))
+        return results
+
+    def save(self, path: str) -> None:
+        """
+        Simpan index ke disk supaya tidak perlu dibangun ulang saat startup.
+        Formatnya data murni (header JSON lalu blob teks dan array integer),
+        bukan pickle, jadi memuat file dari direktori data tidak pernah
+        menjalankan kode.
+        """
+        words = sorted(self.words)
+        word_numbers = {word: number for number, word in enumerate(words)}
+        variants = list(self.deletes)
+        offsets = array('I', [0])
+        indices = array('I')
+        for variant in variants:
+            indices.extend(word_numbers[word] for word in self.deletes[variant])
+            offsets.append(len(indices))
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            indices.byteswap()
+        header = {
+            'version': INDEX_FORMAT_VERSION,
+            'max_distance': self.max_distance,
+            'prefix_length': self.prefix_length,
+            'max_entries': self.max_entries,
+            'entry_count': self.entry_count,
+            'truncated': self.truncated,
+            'fingerprint': self.fingerprint
+        }
+        sections = [
+            json.dumps(header).encode('utf-8'),
+            WORD_SEPARATOR.join(words).encode('utf-8', 'surrogatepass'),
+            WORD_SEPARATOR.join(variants).encode('utf-8', 'surrogatepass'),
+            offsets.tobytes(),
+            indices.tobytes()
+        ]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            for section in sections:
+                f.write(struct.pack('<Q', len(section)))
+                f.write(section)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _read_sections(path: str, count: int) -> List[bytes]:
+        sections = []
+        with open(path, 'rb') as f:
+            for _ in range(count):
+                size_bytes = f.read(8)
+                if len(size_bytes) != 8:
+                    raise ValueError("Truncated SymSpell index file")
+                size = struct.unpack('<Q', size_bytes)[0]
+                section = f.read(size)
+                if len(section) != size:
+                    raise ValueError("Truncated SymSpell index file")
+                sections.append(section)
+        return sections
+
+    @classmethod
+    def load(cls, path: str) -> "SymSpellIndex":
+        header_bytes, words_blob, variants_blob, offsets_bytes, indices_bytes = cls._read_sections(path, 5)
+        state = json.loads(header_bytes.decode('utf-8'))
+        if state.get('version') != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported SymSpell index version: {state.get('version')}")
+        words = words_blob.decode('utf-8', 'surrogatepass').split(WORD_SEPARATOR) if words_blob else []
+        offsets = array('I')
+        offsets.frombytes(offsets_bytes)
+        indices = array('I')
+        indices.frombytes(indices_bytes)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            indices.byteswap()
+        # Varian hapus bisa string kosong, jadi jumlahnya diambil dari offsets
+        variants = variants_blob.decode('utf-8', 'surrogatepass').split(WORD_SEPARATOR) if len(offsets) > 1 else []
+        if len(offsets) != len(variants) + 1 or (offsets and offsets[-1] != len(indices)):
+            raise ValueError("Corrupt SymSpell index file")
+        index = cls(state['max_distance'], state['prefix_length'], state['max_entries'])
+        index.deletes = {
+            variant: [words[number] for number in indices[offsets[i]:offsets[i + 1]]]
+            for i, variant in enumerate(variants)
+        }
+        index.words = set(words)
+        index.entry_count = state['entry_count']
+        index.truncated = state['truncated']
+        index.fingerprint = state.get('fingerprint')
+        return index
+
+    def __len__(self) -> int:
+        return len(self.words)
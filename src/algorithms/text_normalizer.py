@@ -0,0 +1,76 @@
+import re
+import unicodedata
+from array import array
+from functools import lru_cache
+from typing import Tuple
+
+_TOKEN_PATTERN = re.compile(r'\S+')
+
+@lru_cache(maxsize=4096)
+def _fold_char(char: str) -> str:
+    # Casefold lalu buang tanda diakritik (é -> e, ß -> ss)
+    decomposed = unicodedata.normalize('NFKD', char.casefold())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+def _fold_token(token: str) -> str:
+    if token.isascii():
+        return token.lower()
+    return ''.join(_fold_char(char) for char in token)
+
+def normalize_query(text: str) -> str:
+    # Normalisasi keyword dengan aturan yang sama dengan korpus, tanpa peta offset
+    return ' '.join(_fold_token(token) for token in text.split())
+
+class NormalizedText:
+    """
+    Teks yang sudah dinormalisasi (casefold, aksen dibuang, whitespace
+    berurutan dijadikan satu spasi) beserta peta offset ke teks asli:
+    offsets[i] adalah posisi karakter asli yang menghasilkan karakter
+    ke-i teks normal. Dibuat sekali saat korpus dimuat, sehingga pencarian
+    tidak perlu menyalin dan me-lowercase teks di setiap query.
+    """
+    __slots__ = ('original', 'text', 'offsets')
+
+    def __init__(self, original: str):
+        parts = []
+        offsets = array('i')
+        for match in _TOKEN_PATTERN.finditer(original):
+            start, end = match.span()
+            if parts:
+                # Spasi pengganti whitespace menunjuk ke whitespace terakhir sebelum token
+                parts.append(' ')
+                offsets.append(start - 1)
+            token = match.group()
+            if token.isascii():
+                parts.append(token.lower())
+                offsets.extend(range(start, end))
+            else:
+                for i, char in enumerate(token):
+                    folded = _fold_char(char)
+                    parts.append(folded)
+                    offsets.extend([start + i] * len(folded))
+        self.original = original
+        self.text = ''.join(parts)
+        self.offsets = offsets
+
+    def original_position(self, position: int) -> int:
+        # Posisi teks asli untuk posisi di teks normal
+        if position >= len(self.offsets):
+            return len(self.original)
+        return self.offsets[position]
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        # Rentang [start, end) teks normal dipetakan ke rentang teks asli, untuk highlight
+        if end <= start:
+            original_start = self.original_position(start)
+            return original_start, original_start
+        return self.offsets[start], self.offsets[end - 1] + 1
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+def normalize_text(text: str) -> NormalizedText:
+    return NormalizedText(text or "")
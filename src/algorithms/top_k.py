@@ -0,0 +1,59 @@
+import heapq
+from typing import Any, List, Optional, Tuple
+
+class TopK:
+    """
+    Seleksi top-K dengan min-heap berukuran K. Setiap entri punya key skor
+    (tuple, makin besar makin baik) dan nomor urut; key sama dimenangkan
+    nomor urut yang lebih kecil, sama dengan sort stabil descending atas
+    urutan asli.
+
+    can_enter() menerima batas atas key sebuah kandidat: kalau batas atas
+    itu pun tidak mengalahkan entri terlemah di heap, kandidat tidak perlu
+    dihitung sama sekali (gaya WAND/MaxScore). k=None berarti semua entri
+    disimpan.
+    """
+    def __init__(self, k: Optional[int] = None):
+        if k is not None and k < 0:
+            raise ValueError("k must be >= 0")
+        self.k = k
+        self._heap: List[Tuple[Tuple, int, Any]] = []
+
+    def is_full(self) -> bool:
+        return self.k is not None and len(self._heap) >= self.k
+
+    def threshold(self) -> Optional[Tuple[Tuple, int]]:
+        # (key, -urutan) entri terlemah kalau heap sudah penuh, None kalau masih ada tempat
+        if not self.is_full():
+            return None
+        if not self._heap:
+            return ((), 0)
+        key, neg_order, _ = self._heap[0]
+        return key, neg_order
+
+    def can_enter(self, key_bound: Tuple, order: int) -> bool:
+        threshold = self.threshold()
+        if threshold is None:
+            return True
+        if self.k == 0:
+            return False
+        return (key_bound, -order) > threshold
+
+    def offer(self, key: Tuple, order: int, item: Any) -> bool:
+        # Masukkan entri kalau termasuk K terbaik, kembalikan True kalau masuk heap
+        entry = (key, -order, item)
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if self.k == 0 or (key, -order) <= self._heap[0][:2]:
+            return False
+        heapq.heapreplace(self._heap, entry)
+        return True
+
+    def entries(self) -> List[Tuple[Tuple, int, Any]]:
+        # (key, urutan, item) terurut dari yang terbaik
+        ordered = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        return [(key, -neg_order, item) for key, neg_order, item in ordered]
+
+    def __len__(self) -> int:
+        return len(self._heap)
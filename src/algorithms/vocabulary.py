@@ -0,0 +1,165 @@
+import os
+import hashlib
+from typing import Dict, Set, List, Tuple, Iterable, Optional
+from collections import defaultdict
+
+from .bk_tree import BKTree
+from .symspell import SymSpellIndex
+from .levenshtein_automaton import VocabularyTrie, MAX_AUTOMATON_DISTANCE
+from .levenshtein import LevenshteinDistance, PackedCandidates, max_distance_for_similarity, search_tolerance
+
+class VocabularyIndex:
+    """
+    Kosakata korpus: setiap token unik dipetakan ke postings berisi id
+    dokumen yang memuatnya. Lookup fuzzy dilakukan sekali per keyword lewat
+    BK-tree di atas kosakata, lalu hasilnya digabung dari postings, bukan
+    membandingkan keyword dengan setiap kata di setiap dokumen.
+
+    Engine lookup: "bktree" (exact untuk semua toleransi), "symspell"
+    (symmetric delete, jauh lebih cepat), "automaton" (DFA Levenshtein x
+    trie kosakata) atau "batch" (DP numpy ke seluruh kosakata sekaligus).
+    Semua engine exact: toleransi di atas max_distance index SymSpell atau
+    di atas MAX_AUTOMATON_DISTANCE dijawab BK-tree, bukan dipotong. Index
+    SymSpell dibangun saat pertama dipakai dan disimpan ke symspell_path
+    kalau diberikan.
+    """
+    ENGINES = ("bktree", "symspell", "automaton", "batch")
+
+    def __init__(self, min_length: int = 3, symspell_options: Optional[Dict] = None,
+                 symspell_path: Optional[str] = None):
+        self.min_length = min_length
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.symspell_options = symspell_options or {}
+        self.symspell_path = symspell_path
+        self._bk_tree = None
+        self._symspell = None
+        self._trie = None
+        self._packed_words = None
+        self.levenshtein = LevenshteinDistance()
+
+    @staticmethod
+    def tokenize(text: str) -> Set[str]:
+        # Token unik per dokumen, sama dengan pemecahan kata di fuzzy fallback
+        return set(text.lower().split())
+
+    def add_document(self, doc_id: str, text: str) -> None:
+        for token in self.tokenize(text):
+            if len(token) >= self.min_length:
+                self.postings[token].add(doc_id)
+        self._bk_tree = None
+        self._symspell = None
+        self._trie = None
+        self._packed_words = None
+
+    def build(self, documents: Iterable[Tuple[str, str]]) -> "VocabularyIndex":
+        for doc_id, text in documents:
+            self.add_document(doc_id, text)
+        return self
+
+    @property
+    def bk_tree(self) -> BKTree:
+        # BK-tree dibangun sekali dan dipakai ulang sampai kosakata berubah
+        if self._bk_tree is None:
+            self._bk_tree = BKTree(sorted(self.postings))
+        return self._bk_tree
+
+    @property
+    def trie(self) -> VocabularyTrie:
+        if self._trie is None:
+            self._trie = VocabularyTrie(self.postings)
+        return self._trie
+
+    @property
+    def packed_words(self) -> PackedCandidates:
+        # Kosakata dikemas sekali untuk distance_batch
+        if self._packed_words is None:
+            self._packed_words = self.levenshtein.pack(sorted(self.postings))
+        return self._packed_words
+
+    def fingerprint(self) -> str:
+        # Hash kosakata terurut, berubah kalau ada kata yang ditambah atau hilang
+        digest = hashlib.sha1()
+        for word in sorted(self.postings):
+            digest.update(word.encode('utf-8', 'surrogatepass'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    @property
+    def symspell(self) -> SymSpellIndex:
+        # Pakai index dari disk kalau kosakata dan opsinya sama, selain itu bangun ulang
+        if self._symspell is None:
+            fingerprint = self.fingerprint()
+            index = self._load_symspell(fingerprint)
+            if index is None:
+                index = SymSpellIndex(**self.symspell_options)
+                # Kata dengan document frequency tinggi dimasukkan lebih dulu
+                index.build(sorted(self.postings, key=lambda w: (-len(self.postings[w]), w)))
+                index.fingerprint = fingerprint
+                if self.symspell_path:
+                    try:
+                        index.save(self.symspell_path)
+                    except OSError as e:
+                        print(f"⚠️ Could not save SymSpell index: {e}")
+            self._symspell = index
+        return self._symspell
+
+    def _load_symspell(self, fingerprint: str) -> Optional[SymSpellIndex]:
+        if not self.symspell_path or not os.path.exists(self.symspell_path):
+            return None
+        try:
+            index = SymSpellIndex.load(self.symspell_path)
+        except Exception as e:
+            print(f"⚠️ Could not load SymSpell index: {e}")
+            return None
+        expected = SymSpellIndex(**self.symspell_options)
+        if (index.fingerprint != fingerprint or index.max_distance != expected.max_distance
+                or index.prefix_length != expected.prefix_length or index.max_entries != expected.max_entries):
+            return None
+        return index
+
+    def symspell_max_distance(self) -> int:
+        # Jarak maksimum yang dijamin index SymSpell, tanpa harus membangun index-nya
+        if self._symspell is not None:
+            return self._symspell.max_distance
+        return self.symspell_options.get('max_distance', SymSpellIndex().max_distance)
+
+    def fuzzy_lookup(self, keyword: str, threshold: float, engine: str = "bktree") -> List[Tuple[str, int]]:
+        # Kata kosakata dengan similarity >= threshold terhadap keyword
+        length = len(keyword)
+        tolerance = search_tolerance(length, threshold)
+        if tolerance is None:
+            # Threshold <= 0: semua kata lolos
+            tolerance = length + max((len(word) for word in self.postings), default=0)
+        if engine == "symspell" and tolerance > self.symspell_max_distance():
+            # Index tidak menjamin kandidat di atas max_distance-nya, pakai engine exact
+            engine = "bktree"
+        elif engine == "automaton" and tolerance > MAX_AUTOMATON_DISTANCE:
+            # DFA hanya dibangun sampai MAX_AUTOMATON_DISTANCE, jangan potong toleransinya
+            engine = "bktree"
+        if engine == "symspell":
+            candidates = self.symspell.lookup(keyword, tolerance)
+        elif engine == "batch":
+            distances = self.levenshtein.distance_batch(keyword, self.packed_words, tolerance)
+            candidates = [(word, d) for word, d in zip(self.packed_words.candidates, distances) if d <= tolerance]
+        elif engine == "automaton":
+            candidates = self.trie.search(keyword, tolerance)
+        elif engine == "bktree":
+            candidates = self.bk_tree.search(keyword, tolerance)
+        else:
+            raise ValueError(f"Unknown vocabulary engine: {engine}")
+        results = []
+        for word, d in candidates:
+            if d <= max_distance_for_similarity(max(length, len(word)), threshold):
+                results.append((word, d))
+        return results
+
+    def fuzzy_document_counts(self, keyword: str, threshold: float, engine: str = "bktree") -> Dict[str, int]:
+        # Jumlah kata mirip keyword per dokumen (gabungan postings)
+        counts = defaultdict(int)
+        for word, _ in self.fuzzy_lookup(keyword, threshold, engine):
+            for doc_id in self.postings[word]:
+                counts[doc_id] += 1
+        return dict(counts)
+
+    def __len__(self) -> int:
+        return len(self.postings)
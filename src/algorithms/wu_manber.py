@@ -0,0 +1,113 @@
+from typing import List, Dict, Tuple, Iterator, Sequence, Optional
+from collections import defaultdict, OrderedDict
+
+from .aho_corasick import normalize_patterns, build_corpus, _count_matches, _count_per_document
+
+class WuManberMatcher:
+    """
+    Pencarian multi-pattern Wu-Manber. Jendela sepanjang pattern terpendek (m)
+    digeser memakai tabel shift per blok B karakter, sehingga satu kali
+    pemindaian bisa melompati sebagian besar teks untuk semua keyword sekaligus.
+    Blok dengan shift 0 diverifikasi lewat tabel hash blok -> daftar pattern.
+    """
+    def __init__(self, patterns: Tuple[str, ...], block_size: Optional[int] = None):
+        self.patterns = list(patterns)
+        self.min_length = min((len(p) for p in self.patterns), default=0)
+        if block_size is None:
+            block_size = 2 if len(self.patterns) < 100 else 3
+        self.block_size = max(1, min(block_size, self.min_length))
+        self.default_shift = self.min_length - self.block_size + 1
+        self.shift = {}
+        self.hash = defaultdict(list)
+        m = self.min_length
+        b = self.block_size
+        for pattern_id, pattern in enumerate(self.patterns):
+            # Hanya prefix sepanjang m yang dipakai untuk tabel shift
+            for q in range(b, m + 1):
+                block = pattern[q - b:q]
+                shift = m - q
+                if shift < self.shift.get(block, self.default_shift):
+                    self.shift[block] = shift
+            self.hash[pattern[m - b:m]].append(pattern_id)
+        self.hash = dict(self.hash)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[str, int]]:
+        # Hasilkan pasangan (pattern, posisi awal) dalam satu pemindaian
+        if not self.patterns:
+            return
+        patterns = self.patterns
+        shift_table = self.shift
+        hash_table = self.hash
+        default_shift = self.default_shift
+        m = self.min_length
+        b = self.block_size
+        n = len(text)
+        pos = m - 1
+        while pos < n:
+            block = text[pos - b + 1:pos + 1]
+            shift = shift_table.get(block, default_shift)
+            if shift:
+                pos += shift
+                continue
+            start = pos - m + 1
+            for pattern_id in hash_table[block]:
+                if text.startswith(patterns[pattern_id], start):
+                    yield patterns[pattern_id], start
+            pos += 1
+
+    def search(self, text: str) -> Dict[str, List[int]]:
+        # Cari semua pola, lalu kembalikan posisi kemunculannya
+        results = defaultdict(list)
+        for pattern, start_pos in self.iter_matches(text):
+            results[pattern].append(start_pos)
+        return dict(results)
+
+    def count(self, text: str, limit: Optional[int] = None) -> Dict[str, int]:
+        # Jumlah kemunculan tiap pola tanpa menyimpan posisi
+        return _count_matches(self.iter_matches(text), len(self.patterns), limit)
+
+    def contains(self, text: str) -> bool:
+        # True kalau salah satu pola muncul, berhenti di match pertama
+        for _ in self.iter_matches(text):
+            return True
+        return False
+
+    def scan_corpus(self, corpus: str, offsets: Sequence[int]) -> List[Dict[str, int]]:
+        # Satu kali pemindaian untuk seluruh korpus, hasil dihitung per dokumen
+        return _count_per_document(self.iter_matches(corpus), offsets)
+
+class WuManberSearch:
+    def __init__(self, cache_size: int = 32):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def compile(self, patterns: List[str]) -> WuManberMatcher:
+        # Ambil matcher dari cache LRU, bangun baru kalau belum ada
+        key = normalize_patterns(patterns)
+        matcher = self._cache.get(key)
+        if matcher is not None:
+            self._cache.move_to_end(key)
+            return matcher
+        matcher = WuManberMatcher(key)
+        if self.cache_size > 0:
+            self._cache[key] = matcher
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return matcher
+
+    def search_multiple(self, text: str, patterns: List[str]) -> Dict[str, List[int]]:
+        # Cari semua pola, lalu kembalikan posisi kemunculannya
+        return self.compile(patterns).search(text)
+
+    def count_multiple(self, text: str, patterns: List[str], limit: Optional[int] = None) -> Dict[str, int]:
+        # Hitung kemunculan semua pola tanpa menyimpan posisi
+        return self.compile(patterns).count(text, limit)
+
+    def contains_any(self, text: str, patterns: List[str]) -> bool:
+        # Cek apakah minimal satu pola muncul
+        return self.compile(patterns).contains(text)
+
+    def scan_corpus(self, texts: List[str], patterns: List[str]) -> List[Dict[str, int]]:
+        # Hitung kemunculan tiap pola di tiap dokumen dengan satu kali pemindaian
+        corpus, offsets = build_corpus(texts)
+        return self.compile(patterns).scan_corpus(corpus, offsets)
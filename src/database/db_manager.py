@@ -5,6 +5,15 @@ from typing import List, Dict, Optional
 import csv
 import re
 
+# Field ApplicantProfile yang dienkripsi saat enkripsi diaktifkan (date_of_birth bertipe DATE)
+ENCRYPTED_APPLICANT_FIELDS = ['first_name', 'last_name', 'address', 'phone_number']
+
+# Field ApplicationDetail yang dienkripsi, kosong karena role dan cv_path dipakai untuk join/lookup
+ENCRYPTED_APPLICATION_FIELDS: List[str] = []
+
+# Kolom penanda baris ApplicantProfile yang field-nya sudah dienkripsi
+ENCRYPTED_FLAG_COLUMN = 'is_encrypted'
+
 class DatabaseManager:
     def __init__(
         self,
@@ -21,6 +30,9 @@ class DatabaseManager:
         self.database = database
         self.connection = None
         self.is_pymysql = False  # Flag to track which connector is used
+        # Enkripsi field sensitif dan blind index-nya, nonaktif sampai enable_field_encryption dipanggil
+        self.encryption = None
+        self.blind_index = None
         
         try:
             # First try connecting with mysql-connector-python
@@ -133,7 +145,8 @@ class DatabaseManager:
                 last_name VARCHAR(100),
                 date_of_birth DATE,
                 address TEXT,
-                phone_number VARCHAR(50)
+                phone_number VARCHAR(50),
+                is_encrypted TINYINT NOT NULL DEFAULT 0
             )
             """
         )
@@ -151,21 +164,93 @@ class DatabaseManager:
             """
         )
         
+        # Blind index field terenkripsi: satu baris per (applicant, field, hash).
+        # Tabel terpisah tanpa foreign key supaya seeding yang DROP/CREATE ApplicantProfile tetap jalan
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ApplicantBlindIndex (
+                applicant_id INT NOT NULL,
+                field_name VARCHAR(32) NOT NULL,
+                hash_kind CHAR(1) NOT NULL,
+                token_hash CHAR(64) NOT NULL,
+                PRIMARY KEY (field_name, token_hash, applicant_id),
+                INDEX idx_blind_applicant (applicant_id)
+            )
+            """
+        )
+
         self.connection.commit()
         print("Core tables (ApplicantProfile, ApplicationDetail) created successfully")
 
+    def enable_field_encryption(self, encryption, blind_index) -> None:
+        """
+        Aktifkan enkripsi field sensitif ApplicantProfile. encryption adalah
+        DataEncryption, blind_index adalah BlindIndex untuk lookup tanpa dekripsi.
+        """
+        self.encryption = encryption
+        self.blind_index = blind_index
+        self._ensure_encrypted_flag_column()
+
+    def _ensure_encrypted_flag_column(self) -> None:
+        # Seeding membuat ulang ApplicantProfile tanpa kolom penanda, jadi tambahkan kalau belum ada.
+        # Baris yang sudah ada mendapat nilai 0 (plaintext)
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'ApplicantProfile' AND COLUMN_NAME = %s",
+            (self.database, ENCRYPTED_FLAG_COLUMN)
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE ApplicantProfile ADD COLUMN {ENCRYPTED_FLAG_COLUMN} TINYINT NOT NULL DEFAULT 0")
+            self.connection.commit()
+
+    def _write_blind_index(self, cursor, applicant_id: int, plain_fields: Dict) -> None:
+        # Tulis ulang semua hash blind index milik satu applicant
+        cursor.execute("DELETE FROM ApplicantBlindIndex WHERE applicant_id = %s", (applicant_id,))
+        rows = []
+        for field in ENCRYPTED_APPLICANT_FIELDS:
+            for kind, token_hash in self.blind_index.index_hashes(field, plain_fields.get(field)):
+                rows.append((applicant_id, field, kind, token_hash))
+        if rows:
+            cursor.executemany(
+                "INSERT INTO ApplicantBlindIndex (applicant_id, field_name, hash_kind, token_hash) VALUES (%s, %s, %s, %s)",
+                rows
+            )
+
+    def _decrypt_applicant_rows(self, rows: List[Dict]) -> List[Dict]:
+        if not self.encryption or not rows:
+            return rows
+        # Hanya baris bertanda terenkripsi yang didekripsi; baris tanpa penanda dianggap plaintext,
+        # jadi setiap SELECT yang masuk ke sini harus ikut mengambil kolom penanda
+        return [
+            self.encryption.decrypt_dict(row, ENCRYPTED_APPLICANT_FIELDS) if row.get(ENCRYPTED_FLAG_COLUMN, 0) else row
+            for row in rows
+        ]
+
     def insert_applicant(self, first_name: str, last_name: str, date_of_birth: Optional[str] = None, address: str = "", phone_number: str = "") -> int:
         """
         Insert a new applicant into ApplicantProfile and return the new applicant_id.
         date_of_birth should be in 'YYYY-MM-DD' format or None.
         """
+        plain_fields = {'first_name': first_name, 'last_name': last_name, 'address': address, 'phone_number': phone_number}
+        stored_fields = plain_fields
+        if self.encryption:
+            stored_fields = self.encryption.encrypt_dict(plain_fields, ENCRYPTED_APPLICANT_FIELDS)
         cursor = self.connection.cursor()
-        cursor.execute(
-            "INSERT INTO ApplicantProfile (first_name, last_name, date_of_birth, address, phone_number) VALUES (%s, %s, %s, %s, %s)",
-            (first_name, last_name, date_of_birth, address, phone_number)
-        )
+        if self.encryption:
+            cursor.execute(
+                f"INSERT INTO ApplicantProfile (first_name, last_name, date_of_birth, address, phone_number, {ENCRYPTED_FLAG_COLUMN}) VALUES (%s, %s, %s, %s, %s, 1)",
+                (stored_fields['first_name'], stored_fields['last_name'], date_of_birth, stored_fields['address'], stored_fields['phone_number'])
+            )
+        else:
+            cursor.execute(
+                "INSERT INTO ApplicantProfile (first_name, last_name, date_of_birth, address, phone_number) VALUES (%s, %s, %s, %s, %s)",
+                (stored_fields['first_name'], stored_fields['last_name'], date_of_birth, stored_fields['address'], stored_fields['phone_number'])
+            )
+        applicant_id = cursor.lastrowid
+        if self.encryption and self.blind_index:
+            self._write_blind_index(cursor, applicant_id, plain_fields)
         self.connection.commit()
-        return cursor.lastrowid
+        return applicant_id
 
     def insert_application(self, applicant_id: int, application_role: str, cv_path: str) -> int:
         """
@@ -188,12 +273,12 @@ class DatabaseManager:
             """
             SELECT 
                 ap.applicant_id, ap.first_name, ap.last_name, ap.date_of_birth, ap.address, ap.phone_number,
-                ad.detail_id, ad.application_role, ad.cv_path
+                ap.is_encrypted, ad.detail_id, ad.application_role, ad.cv_path
             FROM ApplicantProfile ap
             LEFT JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
             """
         )
-        return cursor.fetchall()
+        return self._decrypt_applicant_rows(cursor.fetchall())
 
     def get_all_applicants(self) -> List[Dict]:
         """
@@ -201,7 +286,108 @@ class DatabaseManager:
         """
         cursor = self.connection.cursor(dictionary=True)
         cursor.execute("SELECT * FROM ApplicantProfile")
-        return cursor.fetchall()
+        return self._decrypt_applicant_rows(cursor.fetchall())
+
+    def find_applicants_by_field(self, field: str, value: str, mode: str = "token") -> List[Dict]:
+        """
+        Cari applicant berdasarkan field terenkripsi lewat blind index.
+        mode: "exact" (nilai utuh), "token" (semua token query ada di field)
+        atau "prefix" (token terakhir cukup prefix). Hanya baris yang cocok
+        di index yang didekripsi, lalu diverifikasi ulang setelah dekripsi.
+        """
+        if field not in ENCRYPTED_APPLICANT_FIELDS:
+            raise ValueError(f"Field is not blind-indexed: {field}")
+        if mode not in ("exact", "token", "prefix"):
+            raise ValueError(f"Unknown lookup mode: {mode}")
+        if not self.encryption or not self.blind_index:
+            # Tanpa enkripsi: bandingkan langsung dengan plaintext
+            rows = self.get_all_applicants()
+            return [row for row in rows if self._field_matches(row.get(field), value, mode)]
+
+        if mode == "exact":
+            hashes = [self.blind_index.exact_hash(field, value)]
+        else:
+            hashes = self.blind_index.query_hashes(field, value, prefix=(mode == "prefix"))
+        if not hashes:
+            # Query terlalu pendek untuk index (prefix < min_prefix): dekripsi semua baris
+            rows = self.get_all_applicants()
+            return [row for row in rows if self._field_matches(row.get(field), value, mode)]
+
+        placeholders = ", ".join(["%s"] * len(hashes))
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(
+            f"""
+            SELECT ap.* FROM ApplicantProfile ap
+            JOIN (
+                SELECT applicant_id FROM ApplicantBlindIndex
+                WHERE field_name = %s AND token_hash IN ({placeholders})
+                GROUP BY applicant_id
+                HAVING COUNT(DISTINCT token_hash) = %s
+            ) matched ON matched.applicant_id = ap.applicant_id
+            """,
+            (field, *hashes, len(hashes))
+        )
+        rows = self._decrypt_applicant_rows(cursor.fetchall())
+        return [row for row in rows if self._field_matches(row.get(field), value, mode)]
+
+    def _field_matches(self, field_value, query: str, mode: str) -> bool:
+        from src.algorithms.blind_index import BlindIndex
+        if mode == "exact":
+            return BlindIndex.tokenize(str(field_value or "")) == BlindIndex.tokenize(query)
+        blind_index = self.blind_index or BlindIndex()
+        return blind_index.matches(str(field_value or ""), query, prefix=(mode == "prefix"))
+
+    def encrypt_existing_applicants(self) -> int:
+        """
+        Enkripsi baris ApplicantProfile yang masih plaintext (misalnya hasil
+        seeding) dan isi blind index-nya. Baris yang sudah dienkripsi ditandai
+        kolom is_encrypted dan dilewati, jadi aman dipanggil berulang kali.
+        Mengembalikan jumlah baris yang dienkripsi.
+        """
+        if not self.encryption or not self.blind_index:
+            raise ValueError("Field encryption is not enabled")
+        self._ensure_encrypted_flag_column()
+        cursor = self.connection.cursor(dictionary=True)
+        cursor.execute(
+            f"SELECT applicant_id, first_name, last_name, address, phone_number FROM ApplicantProfile WHERE {ENCRYPTED_FLAG_COLUMN} = 0"
+        )
+        rows = cursor.fetchall()
+        cursor = self.connection.cursor()
+        updates = []
+        for row in rows:
+            encrypted = self.encryption.encrypt_dict(row, ENCRYPTED_APPLICANT_FIELDS)
+            updates.append(tuple(encrypted[field] for field in ENCRYPTED_APPLICANT_FIELDS) + (row['applicant_id'],))
+            self._write_blind_index(cursor, row['applicant_id'], row)
+        if updates:
+            cursor.executemany(
+                f"UPDATE ApplicantProfile SET first_name = %s, last_name = %s, address = %s, phone_number = %s, {ENCRYPTED_FLAG_COLUMN} = 1 WHERE applicant_id = %s AND {ENCRYPTED_FLAG_COLUMN} = 0",
+                updates
+            )
+        self.connection.commit()
+        return len(updates)
+
+    def rebuild_blind_index(self) -> int:
+        """
+        Bangun ulang seluruh blind index dari data ApplicantProfile (didekripsi
+        kalau enkripsi aktif). Mengembalikan jumlah applicant yang diindex.
+        """
+        if not self.blind_index:
+            raise ValueError("Blind index is not enabled")
+        rows = self.get_all_applicants()
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM ApplicantBlindIndex")
+        index_rows = []
+        for row in rows:
+            for field in ENCRYPTED_APPLICANT_FIELDS:
+                for kind, token_hash in self.blind_index.index_hashes(field, row.get(field)):
+                    index_rows.append((row['applicant_id'], field, kind, token_hash))
+        if index_rows:
+            cursor.executemany(
+                "INSERT INTO ApplicantBlindIndex (applicant_id, field_name, hash_kind, token_hash) VALUES (%s, %s, %s, %s)",
+                index_rows
+            )
+        self.connection.commit()
+        return len(rows)
     
     def import_csv_to_db(self, csv_file_path: str) -> None:
         """Import data from CSV to database"""
@@ -252,6 +438,8 @@ class DatabaseManager:
                         continue
             self.connection.commit()
             cursor.close()
+            # File seeding membuat ulang ApplicantProfile tanpa kolom penanda enkripsi
+            self._ensure_encrypted_flag_column()
             print(f"Successfully imported SQL from {sql_file_path}")
             
         except Exception as e:
@@ -0,0 +1,207 @@
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .db_manager import ENCRYPTED_APPLICANT_FIELDS, ENCRYPTED_APPLICATION_FIELDS, ENCRYPTED_FLAG_COLUMN
+
+# Ukuran batch default: jumlah baris per transaksi
+ROTATION_BATCH_SIZE = 500
+
+# Tabel yang dirotasi: (nama tabel, primary key, kolom terenkripsi, kolom penanda baris terenkripsi)
+ROTATION_TABLES: List[Tuple[str, str, List[str], Optional[str]]] = [
+    ("ApplicantProfile", "applicant_id", ENCRYPTED_APPLICANT_FIELDS, ENCRYPTED_FLAG_COLUMN),
+    ("ApplicationDetail", "detail_id", ENCRYPTED_APPLICATION_FIELDS, None),
+]
+
+class KeyRotationJob:
+    """
+    Rotasi key enkripsi database: baris dibaca per batch berurutan menurut
+    primary key (keyset pagination, WHERE id > terakhir LIMIT n), didekripsi
+    dengan key lama dan dienkripsi dengan key baru lewat decrypt_many /
+    encrypt_many, lalu ditulis balik dengan executemany.
+
+    Setiap batch adalah satu transaksi yang juga memperbarui checkpoint di
+    tabel KeyRotationCheckpoint, sehingga job yang terhenti bisa dijalankan
+    ulang dengan key yang sama dan lanjut dari batch terakhir yang commit.
+    Checkpoint dihapus begitu rotasi selesai, jadi rotasi berikutnya dengan
+    pasangan key yang sama (misalnya A->B, B->A, lalu A->B lagi) mulai dari
+    awal alih-alih melewati semua baris.
+    """
+    def __init__(self, db, old_encryption, new_encryption, blind_index=None,
+                 batch_size: int = ROTATION_BATCH_SIZE, verbose: bool = True):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        self.db = db
+        self.old_encryption = old_encryption
+        self.new_encryption = new_encryption
+        # Kalau diberikan, blind index ikut ditulis ulang dari plaintext per batch
+        self.blind_index = blind_index
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.rotation_id = self._rotation_id(old_encryption.key, new_encryption.key)
+
+    @staticmethod
+    def _rotation_id(old_key: str, new_key: str) -> str:
+        # Id rotasi dari pasangan key, key-nya sendiri tidak disimpan
+        digest = hashlib.sha256(f"{old_key}\x00{new_key}".encode('utf-8')).hexdigest()
+        return digest[:32]
+
+    def _ensure_checkpoint_table(self) -> None:
+        cursor = self.db.connection.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS KeyRotationCheckpoint (
+                rotation_id CHAR(32) NOT NULL,
+                table_name VARCHAR(64) NOT NULL,
+                last_id INT NOT NULL DEFAULT 0,
+                rows_done INT NOT NULL DEFAULT 0,
+                completed TINYINT NOT NULL DEFAULT 0,
+                PRIMARY KEY (rotation_id, table_name)
+            )
+            """
+        )
+        self.db.connection.commit()
+
+    def _clear_checkpoints(self) -> None:
+        # Rotasi selesai: checkpoint hanya berguna untuk melanjutkan run yang terhenti
+        cursor = self.db.connection.cursor()
+        cursor.execute("DELETE FROM KeyRotationCheckpoint WHERE rotation_id = %s", (self.rotation_id,))
+        self.db.connection.commit()
+
+    def load_checkpoint(self, table: str) -> Tuple[int, int, bool]:
+        # (last_id, rows_done, completed) untuk tabel ini, (0, 0, False) kalau belum mulai
+        cursor = self.db.connection.cursor()
+        cursor.execute(
+            "SELECT last_id, rows_done, completed FROM KeyRotationCheckpoint WHERE rotation_id = %s AND table_name = %s",
+            (self.rotation_id, table)
+        )
+        row = cursor.fetchone()
+        if not row:
+            return 0, 0, False
+        return int(row[0]), int(row[1]), bool(row[2])
+
+    def _save_checkpoint(self, cursor, table: str, last_id: int, rows_done: int, completed: bool) -> None:
+        cursor.execute(
+            """
+            INSERT INTO KeyRotationCheckpoint (rotation_id, table_name, last_id, rows_done, completed)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE last_id = VALUES(last_id), rows_done = VALUES(rows_done), completed = VALUES(completed)
+            """,
+            (self.rotation_id, table, last_id, rows_done, int(completed))
+        )
+
+    def _fetch_batch(self, table: str, key: str, columns: List[str], last_id: int,
+                     flag_column: Optional[str] = None) -> List[tuple]:
+        # Kalau tabel punya kolom penanda, baris yang masih plaintext tidak ikut dirotasi
+        flag_filter = f" AND {flag_column} = 1" if flag_column else ""
+        cursor = self.db.connection.cursor()
+        cursor.execute(
+            f"SELECT {key}, {', '.join(columns)} FROM {table} WHERE {key} > %s{flag_filter} ORDER BY {key} LIMIT %s",
+            (last_id, self.batch_size)
+        )
+        return cursor.fetchall()
+
+    def _rotate_values(self, rows: List[tuple], columns: List[str]) -> Tuple[List[List[str]], List[List[str]]]:
+        # Dekripsi dan enkripsi per kolom dengan jalur bulk, hasilnya (plaintext, ciphertext baru) per kolom
+        plain_columns = []
+        cipher_columns = []
+        for position in range(1, len(columns) + 1):
+            values = [row[position] for row in rows]
+            plaintexts = self.old_encryption.decrypt_many(values)
+            ciphertexts = self.new_encryption.encrypt_many(plaintexts)
+            # NULL tetap NULL
+            plain_columns.append([None if value is None else text for value, text in zip(values, plaintexts)])
+            cipher_columns.append([None if value is None else text for value, text in zip(values, ciphertexts)])
+        return plain_columns, cipher_columns
+
+    def _rewrite_blind_index(self, cursor, applicant_ids: List[int], plain_columns: List[List[str]]) -> None:
+        placeholders = ", ".join(["%s"] * len(applicant_ids))
+        cursor.execute(f"DELETE FROM ApplicantBlindIndex WHERE applicant_id IN ({placeholders})", applicant_ids)
+        index_rows = []
+        for field, values in zip(ENCRYPTED_APPLICANT_FIELDS, plain_columns):
+            for applicant_id, value in zip(applicant_ids, values):
+                for kind, token_hash in self.blind_index.index_hashes(field, value):
+                    index_rows.append((applicant_id, field, kind, token_hash))
+        if index_rows:
+            cursor.executemany(
+                "INSERT INTO ApplicantBlindIndex (applicant_id, field_name, hash_kind, token_hash) VALUES (%s, %s, %s, %s)",
+                index_rows
+            )
+
+    def rotate_table(self, table: str, key: str, columns: List[str], flag_column: Optional[str] = None) -> Dict:
+        """
+        Rotasi satu tabel mulai dari checkpoint. Mengembalikan statistik:
+        rows (baris yang dirotasi di run ini), total, seconds, rows_per_sec.
+        """
+        last_id, rows_done, completed = self.load_checkpoint(table)
+        stats = {'table': table, 'rows': 0, 'total': rows_done, 'seconds': 0.0, 'rows_per_sec': 0.0}
+        if completed or not columns:
+            if not completed:
+                cursor = self.db.connection.cursor()
+                self._save_checkpoint(cursor, table, last_id, rows_done, True)
+                self.db.connection.commit()
+            return stats
+
+        assignments = ", ".join(f"{column} = %s" for column in columns)
+        update_sql = f"UPDATE {table} SET {assignments} WHERE {key} = %s"
+        rewrite_index = self.blind_index is not None and table == "ApplicantProfile"
+        started = time.perf_counter()
+        while True:
+            rows = self._fetch_batch(table, key, columns, last_id, flag_column)
+            if not rows:
+                break
+            plain_columns, cipher_columns = self._rotate_values(rows, columns)
+            ids = [row[0] for row in rows]
+            updates = [tuple(values) + (row_id,) for row_id, values in zip(ids, zip(*cipher_columns))]
+            cursor = self.db.connection.cursor()
+            try:
+                cursor.executemany(update_sql, updates)
+                if rewrite_index:
+                    self._rewrite_blind_index(cursor, ids, plain_columns)
+                last_id = ids[-1]
+                rows_done += len(rows)
+                self._save_checkpoint(cursor, table, last_id, rows_done, False)
+                self.db.connection.commit()
+            except Exception:
+                self.db.connection.rollback()
+                raise
+            stats['rows'] += len(rows)
+            if self.verbose:
+                elapsed = time.perf_counter() - started
+                rate = stats['rows'] / elapsed if elapsed > 0 else 0.0
+                print(f"🔑 {table}: {rows_done} rows rotated (last id {last_id}, {rate:.0f} rows/s)")
+            if len(rows) < self.batch_size:
+                break
+
+        cursor = self.db.connection.cursor()
+        self._save_checkpoint(cursor, table, last_id, rows_done, True)
+        self.db.connection.commit()
+        stats['total'] = rows_done
+        stats['seconds'] = time.perf_counter() - started
+        stats['rows_per_sec'] = stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        return stats
+
+    def run(self) -> List[Dict]:
+        """
+        Rotasi semua tabel di ROTATION_TABLES lalu pindahkan DatabaseManager
+        ke key baru. Run yang terhenti bisa dijalankan ulang: tabel yang sudah
+        selesai dilewati. Setelah semua tabel selesai checkpoint dihapus.
+        """
+        self._ensure_checkpoint_table()
+        report = []
+        for table, key, columns, flag_column in ROTATION_TABLES:
+            stats = self.rotate_table(table, key, columns, flag_column)
+            report.append(stats)
+            if self.verbose and stats['rows']:
+                print(f"✅ {table}: {stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_sec']:.0f} rows/s)")
+        self._clear_checkpoints()
+        if self.db.encryption is not None:
+            self.db.encryption = self.new_encryption
+        if self.blind_index is not None and self.db.blind_index is not None:
+            self.db.blind_index = self.blind_index
+        return report
+
+def rotate_encryption_key(db, old_encryption, new_encryption, blind_index=None,
+                          batch_size: int = ROTATION_BATCH_SIZE, verbose: bool = True) -> List[Dict]:
+    # Shortcut untuk menjalankan KeyRotationJob sekali jalan
+    return KeyRotationJob(db, old_encryption, new_encryption, blind_index, batch_size, verbose).run()
@@ -4,9 +4,11 @@ import csv
 import time
 import math
 import random
+import threading
 import traceback
 import flet as ft
 from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
 
 # Adjust sys.path untuk allow import dari folder src
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -14,9 +16,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 from src.algorithms.kmp import KMPSearch
 from src.algorithms.bm import BoyerMooreSearch
 from src.algorithms.aho_corasick import AhoCorasickSearch
+from src.algorithms.wu_manber import WuManberSearch
 from src.algorithms.levenshtein import LevenshteinDistance
+from src.algorithms.bitap import BitapSearch
 from src.utils.pdf_extractor import PDFExtractor
 from src.utils.regex_extractor import RegexExtractor
+from src.utils.cv_info_cache import CVInfoCache
 from src.database.db_manager import DatabaseManager
 from src.frontend.components import (
     create_header_component,
@@ -42,7 +47,11 @@ from src.frontend.event_handlers import (
 from src.frontend.utils import (
     load_seed_data_util,
     load_extracted_cv_data_util,
+    get_parallel_executor_util,
+    load_vocabulary_index_util,
+    get_parsed_cv_info_util,
     load_cvs_from_db_util,
+    CV_INFO_CACHE_PATH,
     update_summary_result_section_util,
     get_paginated_results_util,
     update_pagination_util,
@@ -74,19 +83,36 @@ class ATSFrontend:
         # Load data CV yang sudah diekstrak dari file CSV
         self.load_extracted_cv_data()
 
+        # Bangun kosakata korpus untuk fuzzy search
+        self.load_vocabulary_index()
+
         self.current_page = "home"
         self.search_results = []
         self.selected_cv = None
         self.current_pagination_page = 1
         self.results_per_page = 5
 
+        # Pencarian berjalan di satu thread latar belakang; generation naik setiap pencarian
+        # baru dan pencarian lama berhenti sendiri begitu melihat generation berubah
+        self.search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cv-search")
+        self.search_lock = threading.Lock()
+        self.search_generation = 0
+        self.search_future = None
+
         # Menginisialisasi algoritma
         self.kmp_search = KMPSearch()
-        self.bm_search = BoyerMooreSearch()
+        self.bm_search = BoyerMooreSearch(variant="auto")
         self.ac_search = AhoCorasickSearch()
+        self.wm_search = WuManberSearch()
         self.levenshtein = LevenshteinDistance()
+        self.bitap_search = BitapSearch()
+        # Engine fuzzy fallback: "bktree" / "symspell" / "automaton" / "batch" (kosakata korpus), "bitap"
+        # (k-error di teks utuh) atau "levenshtein" (per kata)
+        self.fuzzy_engine = "bktree"
         self.pdf_extractor = PDFExtractor()
         self.regex_extractor = RegexExtractor()
+        # Hasil regex per CV di-memo dan disimpan ke disk, diparse saat summary dibuka
+        self.cv_info_cache = CVInfoCache(self.regex_extractor, CV_INFO_CACHE_PATH)
 
     # Delegated methods
     def load_seed_data(self):
@@ -95,6 +121,15 @@ class ATSFrontend:
     def load_extracted_cv_data(self):
         load_extracted_cv_data_util(self)
 
+    def load_vocabulary_index(self):
+        load_vocabulary_index_util(self)
+
+    def get_parallel_executor(self):
+        return get_parallel_executor_util(self)
+
+    def get_parsed_cv_info(self, cv_data):
+        return get_parsed_cv_info_util(self, cv_data)
+
     def load_cvs_from_db(self):
         return load_cvs_from_db_util(self)
 
@@ -111,7 +146,7 @@ class ATSFrontend:
         return create_home_view_component(self)
 
     def search_cv(self, e):
-        handle_search_cv(self, e)
+        return handle_search_cv(self, e)
 
     def update_summary_result_section(self, total_cvs: int, exact_time: float, fuzzy_time: float, algorithm: str):
         update_summary_result_section_util(self, total_cvs, exact_time, fuzzy_time, algorithm)
@@ -441,7 +441,8 @@ def create_summary_dialog_component(app, cv_data, parsed_info):
         
     # Format and organize the extracted information
     emails = parsed_info.get('emails', [])
-    phones = parsed_info.get('phones', [])
+    # Salinan, supaya phone dari database tidak ikut tersimpan di parsed_info/cache
+    phones = list(parsed_info.get('phones', []))
     skills = parsed_info.get('skills', [])
     education = parsed_info.get('education', [])
     experience = parsed_info.get('experience', [])
@@ -533,7 +534,8 @@ def create_summary_page_component(app, cv_data, parsed_info):
         names = [f"CV {cv_data.get('cv_id', 'Unknown')}" ]
 
     emails = parsed_info.get('emails', [])
-    phones = parsed_info.get('phones', [])
+    # Salinan, supaya phone dari database tidak ikut tersimpan di parsed_info/cache
+    phones = list(parsed_info.get('phones', []))
     skills = parsed_info.get('skills', [])
     education = parsed_info.get('education', [])
     experience = parsed_info.get('experience', [])
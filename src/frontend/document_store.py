@@ -0,0 +1,126 @@
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.algorithms.text_normalizer import NormalizedText, normalize_text
+from src.algorithms.aho_corasick import build_corpus
+from src.algorithms.inverted_index import InvertedIndex
+
+# Field record database yang ikut dicari, urutannya sama dengan teks pencarian
+SEARCHABLE_DB_FIELDS = [
+    'first_name', 'last_name', 'address', 'phone_number',
+    'application_role', 'date_of_birth', 'applicant_id', 'detail_id'
+]
+
+def build_searchable_text(resume_text, db_record, category) -> str:
+    """
+    Gabungkan teks resume, field profil dari database, dan kategori menjadi
+    satu teks yang dipakai untuk pencarian.
+    """
+    parts = [resume_text or ""]
+    if db_record:
+        values = []
+        for field in SEARCHABLE_DB_FIELDS:
+            value = db_record.get(field, '')
+            if field in ('applicant_id', 'detail_id'):
+                value = str(value)
+            if value:
+                values.append(str(value))
+        parts.append(' '.join(values))
+    if category:
+        parts.append(category)
+    return ' '.join(parts)
+
+class SearchDocument:
+    """
+    Satu CV siap cari: teks pencarian final yang sudah dinormalisasi dan
+    record database yang cocok.
+    """
+    __slots__ = ('cv_id', 'category', 'resume_str', 'resume_html', 'db_record',
+                 'name', 'search_text')
+
+    def __init__(self, cv_id: str, category: str, resume_str: str, resume_html: str, db_record: Dict):
+        self.cv_id = cv_id
+        self.category = category
+        self.resume_str = resume_str
+        self.resume_html = resume_html
+        self.db_record = db_record
+        self.name = f"CV {cv_id}"
+        if db_record:
+            first_name = db_record.get('first_name', '')
+            last_name = db_record.get('last_name', '')
+            if first_name or last_name:
+                self.name = f"{first_name} {last_name}".strip()
+        self.search_text: NormalizedText = normalize_text(build_searchable_text(resume_str, db_record, category))
+
+    @property
+    def text(self) -> str:
+        return self.search_text.text
+
+class DocumentStore:
+    """
+    Dokumen pencarian yang dibangun sekali saat startup dan dibangun ulang
+    lewat refresh() kalau data CSV atau database berubah. Query cukup
+    menjalankan pencocokan di atas texts / corpus / inverted_index, tanpa
+    lookup cv_path per baris dan tanpa menyusun string per CV.
+
+    inverted_index dibangun kalau use_inverted_index aktif. Buffer corpus
+    untuk scan multi-pattern hanya dibangun kalau index tidak ada (dimatikan
+    atau gagal dibangun), karena hanya jalur itu yang memakainya.
+    """
+    def __init__(self, get_cv_id: Callable[[str], Optional[str]], use_inverted_index: bool = True):
+        # get_cv_id memetakan cv_path record database ke cv_id
+        self.get_cv_id = get_cv_id
+        self.use_inverted_index = use_inverted_index
+        self.documents: List[SearchDocument] = []
+        # Record database yang punya cv_id tapi tidak ada di CSV hasil ekstraksi
+        self.db_only_documents: List[SearchDocument] = []
+        self.records: Dict[str, Dict] = {}
+        self.texts: List[str] = []
+        self.corpus = None
+        self.inverted_index: Optional[InvertedIndex] = None
+        self.db_row_count = 0
+        # Naik setiap refresh, dipakai untuk membuang cache yang bergantung pada isi store
+        self.version = 0
+
+    def build_records(self, db_cvs: Iterable[Dict]) -> Dict[str, Dict]:
+        # Petakan cv_id (dari cv_path) ke record database
+        records = {}
+        for cv in db_cvs:
+            cv_id_path = cv.get('cv_path', '')
+            cv_id = self.get_cv_id(cv_id_path) if cv_id_path else None
+            if cv_id:
+                records[cv_id] = cv
+        return records
+
+    def refresh(self, extracted_cvs: List[Dict], db_cvs: List[Dict]) -> "DocumentStore":
+        self.records = self.build_records(db_cvs)
+        self.db_row_count = len(db_cvs)
+        self.documents = [
+            SearchDocument(cv['cv_id'], cv['category'], cv['resume_str'], cv['resume_html'],
+                           self.records.get(cv['cv_id'], {}))
+            for cv in extracted_cvs
+        ]
+        extracted_ids = set(cv['cv_id'] for cv in extracted_cvs)
+        self.db_only_documents = []
+        for cv_db_record in db_cvs:
+            cv_id = cv_db_record.get('cv_id')
+            if not cv_id or cv_id in extracted_ids:
+                continue
+            self.db_only_documents.append(
+                SearchDocument(cv_id, cv_db_record.get('category', ''), "", "", cv_db_record)
+            )
+        self.texts = [document.text for document in self.documents]
+        self.inverted_index = None
+        if self.use_inverted_index:
+            try:
+                self.inverted_index = InvertedIndex().build((document.cv_id, document.text) for document in self.documents)
+            except Exception as e:
+                print(f"⚠️ Could not build inverted index, falling back to corpus scan: {e}")
+        self.corpus = build_corpus(self.texts) if self.inverted_index is None else None
+        self.version += 1
+        return self
+
+    def is_empty(self) -> bool:
+        return not self.documents and not self.db_row_count
+
+    def __len__(self) -> int:
+        return len(self.documents)
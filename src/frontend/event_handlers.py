@@ -1,162 +1,306 @@
 import flet as ft
+import math
 import time
 import traceback
 import os
+from src.algorithms.levenshtein import max_distance_for_similarity
+from src.algorithms.text_normalizer import normalize_query
+from src.algorithms.aho_corasick import build_corpus
+from src.algorithms.top_k import TopK
+
+FUZZY_SIMILARITY_THRESHOLD = 0.7
+
+# Jumlah dokumen per shard di pencarian latar belakang; pembatalan dicek dan hasil parsial dikirim per shard
+SEARCH_SHARD_SIZE = 64
+# Jeda minimum (detik) antar render hasil parsial supaya UI tidak dibanjiri update
+PARTIAL_RENDER_INTERVAL = 0.2
+
+def search_button_content(searching, progress=None):
+    if not searching:
+        return ft.Row([
+            ft.Text("🔍 Mulai Pencarian CV", color=ft.Colors.WHITE, size=18, weight=ft.FontWeight.BOLD)
+        ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
+    label = "Sedang mencari..." if progress is None else f"Sedang mencari... {progress}"
+    return ft.Row([
+        ft.Icon(ft.Icons.HOURGLASS_EMPTY, color=ft.Colors.WHITE, size=24),
+        ft.Text(label, color=ft.Colors.WHITE, size=18, weight=ft.FontWeight.BOLD)
+    ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
 
 def handle_search_cv(app, e):
     if not app.keyword_input.value:
         app.show_snackbar("⚠️ Mohon masukkan kata kunci untuk pencarian!", ft.Colors.ORANGE_600)
         return
 
+    keywords = [k.strip() for k in app.keyword_input.value.split(",") if k.strip()]
+    algorithm = app.algorithm_radio.value
+    top_matches_filter = app.top_matches_dropdown.value
+
+    # Pencarian baru membatalkan pencarian yang sedang berjalan: worker lama melihat
+    # generation berubah di batas shard berikutnya lalu berhenti tanpa menyentuh UI
+    with app.search_lock:
+        app.search_generation += 1
+        generation = app.search_generation
+
     app.loading_indicator.visible = True
-    app.search_button.content.content = ft.Row([
-        ft.Icon(ft.Icons.HOURGLASS_EMPTY, color=ft.Colors.WHITE, size=24),
-        ft.Text("Sedang mencari...", color=ft.Colors.WHITE, size=18, weight=ft.FontWeight.BOLD)
-    ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
-    app.search_button.content.disabled = True
+    # Tombol tetap aktif selama mencari, klik berikutnya memulai pencarian baru
+    app.search_button.content.content = search_button_content(True)
+    app.current_pagination_page = 1
     app.page.update()
 
-    try:
-        keywords = [k.strip() for k in app.keyword_input.value.split(",") if k.strip()]
-        algorithm = app.algorithm_radio.value
-        top_matches_filter = app.top_matches_dropdown.value
+    app.search_future = app.search_executor.submit(
+        run_search, app, generation, keywords, algorithm, top_matches_filter
+    )
+    return app.search_future
+
+def search_cancelled(app, generation):
+    return app.search_generation != generation
+
+# Batas atas key untuk CV tanpa match exact: paling baik fuzzy dengan semua keyword ditemukan
+FUZZY_KEY_BOUND = (1.0, 2, math.inf, math.inf)
+
+def ranking_key(match_type, keywords_found_count, total_matches, similarity, keyword_total):
+    # Urutan hasil: coverage keyword, jenis match, jumlah match, lalu similarity
+    coverage = keywords_found_count / keyword_total if keyword_total else 0
+    match_type_score = 3 if match_type == 'exact' else 2 if match_type == 'fuzzy' else 0
+    return (coverage, match_type_score, total_matches, similarity)
+
+def exact_similarity(total_matches, keywords_found_count, keyword_total):
+    keyword_coverage = keywords_found_count / keyword_total if keyword_total else 0
+    avg_frequency = total_matches / keywords_found_count if keywords_found_count > 0 else 0
+    return keyword_coverage * 0.7 + min(1.0, avg_frequency / 5) * 0.3
+
+def fuzzy_similarity(fuzzy_total, fuzzy_keywords_found, keyword_total):
+    keyword_coverage = fuzzy_keywords_found / keyword_total if keyword_total else 0
+    avg_frequency = fuzzy_total / fuzzy_keywords_found if fuzzy_keywords_found > 0 else 0
+    return keyword_coverage * 0.6 + min(1.0, avg_frequency / 3) * 0.4
+
+def search_order(documents, corpus_results):
+    # Dokumen dengan match exact diproses lebih dulu, yang paling banyak keyword dan match
+    # di depan, sehingga shard pertama sudah berisi kandidat halaman pertama dan heap top-K
+    # cepat terisi skor tinggi
+    if corpus_results is None:
+        return list(range(len(documents)))
+    matched = [index for index, result in enumerate(corpus_results) if result[1] > 0]
+    matched.sort(key=lambda index: (corpus_results[index][2], corpus_results[index][1]), reverse=True)
+    unmatched = [index for index, result in enumerate(corpus_results) if result[1] == 0]
+    return matched + unmatched
+
+def build_result_record(document, db_only, keywords, match):
+    # Record hasil lengkap (termasuk teks resume) hanya dibuat untuk CV yang lolos top-K
+    matches, total_matches, keywords_found_count, match_type, similarity = match
+    cv_id = document.cv_id
+    db_record = document.db_record
+    category = document.category
+    if db_only:
+        # CV yang ada di database tapi tidak ada di extracted_cvs.csv: tanpa teks hasil ekstraksi
+        cv_data = {
+            'cv_id': cv_id, 'name': document.name,
+            'first_name': db_record.get('first_name', ''), 'last_name': db_record.get('last_name', ''),
+            'address': db_record.get('address', ''), 'phone': db_record.get('phone_number', ''),
+            'application_role': db_record.get('application_role', category),
+            'cv_path': db_record.get('cv_path', f"data/cv/{category}/{cv_id}.pdf" if category else f"data/cv/UNKNOWN/{cv_id}.pdf"),
+            'category': category,
+            'resume_text': "", 'resume_html': "", # No extracted text for these
+            'parsed_info': {}, # Empty for these
+            'emails': [], 'phones': [], 'skills': [], 'education': [], 'experience': [], 'summary': [], 'names': []
+        }
+    else:
+        cv_data = {
+            'cv_id': cv_id, 'name': document.name,
+            'first_name': db_record.get('first_name', ''), 'last_name': db_record.get('last_name', ''),
+            'address': db_record.get('address', ''), 'phone': db_record.get('phone_number', ''),
+            'application_role': db_record.get('application_role', category),
+            'cv_path': db_record.get('cv_path', f"data/cv/{category}/{cv_id}.pdf"),
+            'category': category, 'resume_text': document.resume_str, 'resume_html': document.resume_html,
+            # Info hasil regex diparse saat summary dibuka, lihat app.get_parsed_cv_info
+            'parsed_info': None
+        }
+    return {
+        'cv_data': cv_data,
+        'matches': matches, 'match_count': total_matches, 'match_type': match_type,
+        'similarity_score': similarity, 'keywords_found': keywords_found_count,
+        'total_keywords': len(keywords),
+        'keyword_coverage': (keywords_found_count / len(keywords) if keywords else 0)
+    }
+
+def top_k_results(store, top_k, keywords, records):
+    # Record lengkap untuk isi heap top-K, di-cache per nomor urut antar render parsial
+    documents = store.documents
+    results = []
+    for _, order, match in top_k.entries():
+        record = records.get(order)
+        if record is None:
+            if order < len(documents):
+                record = build_result_record(documents[order], False, keywords, match)
+            else:
+                record = build_result_record(store.db_only_documents[order - len(documents)], True, keywords, match)
+            records[order] = record
+        results.append(record)
+    return results
+
+def publish_partial_results(app, generation, results, processed, total):
+    # Render hasil sementara; halaman yang sedang dibuka user dipertahankan
+    with app.search_lock:
+        if search_cancelled(app, generation):
+            return
+        app.search_results = results
+        app.search_button.content.content = search_button_content(True, f"{processed}/{total} CV")
+        app.update_results_display()
+        app.page.update()
 
-        start_time = time.time()
+def run_search(app, generation, keywords, algorithm, top_matches_filter):
+    """
+    Pipeline pencarian yang dijalankan di app.search_executor (thread latar
+    belakang). Dokumen diproses per shard SEARCH_SHARD_SIZE; setelah setiap
+    shard pembatalan dicek dan top-K sementara dirender, jadi kartu halaman
+    pertama muncul sebelum seluruh korpus selesai.
+
+    Peringkat disimpan di heap TopK berukuran sesuai filter Top N. Skor
+    exact sudah diketahui dari index, sedangkan CV tanpa match exact paling
+    baik menjadi fuzzy dengan coverage penuh (FUZZY_KEY_BOUND); CV yang batas
+    atasnya tidak bisa masuk heap dilewati tanpa fuzzy search, dan record
+    lengkap hanya dibangun untuk pemenang. Hasil akhirnya sama dengan
+    mengurutkan semua CV lalu memotong N teratas.
+    """
+    try:
         exact_search_time = 0
         fuzzy_search_time = 0
-        extracted_cvs = getattr(app, 'extracted_cvs', [])
-        db_cvs = app.load_cvs_from_db()
-
-        db_lookup = {}
-        extracted_cv_ids = set()
-
-        for cv in db_cvs:
-            cv_id_path = cv.get('cv_path', '')
-            cv_id = app.db.get_cv_id_from_path(cv_id_path) if cv_id_path else None
-            if cv_id:
-                db_lookup[cv_id] = cv
-        
-        if extracted_cvs:
-            for extracted_cv in extracted_cvs:
-                extracted_cv_ids.add(extracted_cv['cv_id'])
-
-        if not extracted_cvs and not db_cvs:
-            app.show_snackbar("⚠️ Tidak ada data CV yang tersedia. Periksa database atau jalankan extract_cv_to_csv.py.", ft.Colors.ORANGE_600)
-            app.loading_indicator.visible = False
-            app.search_button.content.disabled = False
-            app.search_button.content.content = ft.Row([
-                ft.Text("🔍 Mulai Pencarian CV", color=ft.Colors.WHITE, size=18, weight=ft.FontWeight.BOLD)
-            ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
-            app.page.update()
+        # Teks pencarian, record database dan index sudah disiapkan di document store saat load
+        store = app.document_store
+        documents = store.documents
+
+        if store.is_empty():
+            if not search_cancelled(app, generation):
+                app.show_snackbar("⚠️ Tidak ada data CV yang tersedia. Periksa database atau jalankan extract_cv_to_csv.py.", ft.Colors.ORANGE_600)
             return
 
-        all_results = []
-        # Process extracted CVs first
-        if extracted_cvs:
-            for extracted_cv in extracted_cvs:
-                cv_id = extracted_cv['cv_id']
-                resume_text = extracted_cv['resume_str']
-                resume_html = extracted_cv['resume_html']
-                category = extracted_cv['category']
-                parsed_info = app.regex_extractor.extract_cv_info(resume_text) if resume_text else {}
-                db_record = db_lookup.get(cv_id, {})
-
-                searchable_text = resume_text or ""
-                if db_record:
-                    db_fields = [
-                        db_record.get('first_name', ''), db_record.get('last_name', ''),
-                        db_record.get('address', ''), db_record.get('phone_number', ''),
-                        db_record.get('application_role', ''), db_record.get('date_of_birth', ''),
-                        str(db_record.get('applicant_id', '')), str(db_record.get('detail_id', ''))
-                    ]
-                    db_text = ' '.join([str(field) for field in db_fields if field])
-                    searchable_text += ' ' + db_text
-                if category:
-                    searchable_text += ' ' + category
-                
-                matches, total_matches, keywords_found_count, current_exact_time = perform_exact_search(app, searchable_text, keywords, algorithm)
-                exact_search_time += current_exact_time
+        compiled_keywords = compile_keywords(app, keywords, algorithm)
+        keyword_total = len(keywords)
+
+        # Inverted index: hitungan exact dari postings, engine hanya memverifikasi match
+        # yang melewati batas token. Tanpa index (dimatikan lewat USE_INVERTED_INDEX atau
+        # gagal dibangun) semua dokumen dihitung paralel oleh pool worker kalau tersedia;
+        # kalau tidak, Aho-Corasick dan BM multi-keyword (Wu-Manber) memindai korpus sekali
+        corpus_results = None
+        use_index = store.inverted_index is not None and algorithm in ("KMP", "BM", "AC")
+        parallel_executor = None
+        if not use_index and documents:
+            parallel_executor = app.get_parallel_executor()
+            if parallel_executor is not None and len(parallel_executor) != len(documents):
+                parallel_executor = None
+        if use_index and documents:
+            corpus_results, corpus_time = perform_indexed_exact_search(app, store.inverted_index, store.texts, keywords, algorithm, compiled_keywords)
+            exact_search_time += corpus_time
+        elif parallel_executor is not None:
+            corpus_results, corpus_time = perform_parallel_exact_search(app, parallel_executor, keywords, algorithm)
+            exact_search_time += corpus_time
+        elif (algorithm == "AC" or (algorithm == "BM" and len(keywords) > 1)) and documents:
+            corpus_results, corpus_time = perform_corpus_exact_search(app, store.texts, keywords, algorithm, store.corpus)
+            exact_search_time += corpus_time
+        if search_cancelled(app, generation):
+            return
 
-                match_type = 'no_match'
-                similarity = 0.0
-                current_fuzzy_time = 0
+        # Lookup kosakata dijalankan sekali per query saat CV pertama butuh fuzzy fallback
+        vocabulary_fuzzy = None
+        vocabulary = getattr(app, 'vocabulary', None)
+        use_vocabulary = vocabulary is not None and getattr(app, 'fuzzy_engine', '') in vocabulary.ENGINES
+
+        # Fuzzy per dokumen (bitap/levenshtein) dibagi ke worker per shard, hanya untuk CV
+        # tanpa match exact yang masih bisa masuk heap. Pool dibuat saat pertama dibutuhkan
+        use_parallel_fuzzy = not use_vocabulary and corpus_results is not None
+
+        top_k = TopK(None if top_matches_filter == "all" else int(top_matches_filter))
+        records = {}
+        order = search_order(documents, corpus_results)
+        total_documents = len(order) + len(store.db_only_documents)
+        processed = 0
+        last_render = 0.0
+        terminated = False
+
+        for shard_start in range(0, len(order), SEARCH_SHARD_SIZE):
+            if search_cancelled(app, generation):
+                return
+            # Tahap 1: hitungan exact; CV tanpa match exact yang masih bisa masuk heap
+            # ditunda ke tahap fuzzy
+            fuzzy_pending = []
+            for index in order[shard_start:shard_start + SEARCH_SHARD_SIZE]:
+                if corpus_results is not None:
+                    matches, total_matches, keywords_found_count = corpus_results[index]
+                    if total_matches == 0 and not top_k.can_enter(FUZZY_KEY_BOUND, index):
+                        # Urutan search_order: sisa dokumen juga tanpa match exact dan
+                        # heap hanya makin ketat, jadi tidak ada lagi yang bisa masuk
+                        terminated = True
+                        break
+                else:
+                    matches, total_matches, keywords_found_count, current_exact_time = perform_exact_search(app, documents[index].text, keywords, algorithm, compiled_keywords, normalized=True)
+                    exact_search_time += current_exact_time
+                processed += 1
 
                 if total_matches > 0:
-                    match_type = 'exact'
-                    keyword_coverage = keywords_found_count / len(keywords) if keywords else 0
-                    avg_frequency = total_matches / keywords_found_count if keywords_found_count > 0 else 0
-                    similarity = keyword_coverage * 0.7 + min(1.0, avg_frequency / 5) * 0.3
-                else: # Fallback to fuzzy search
-                    fuzzy_matches_dict, fuzzy_total, fuzzy_keywords_found, current_fuzzy_time = perform_fuzzy_search(app, searchable_text, keywords)
+                    similarity = exact_similarity(total_matches, keywords_found_count, keyword_total)
+                    key = ranking_key('exact', keywords_found_count, total_matches, similarity, keyword_total)
+                    top_k.offer(key, index, (matches, total_matches, keywords_found_count, 'exact', similarity))
+                elif top_k.can_enter(FUZZY_KEY_BOUND, index):
+                    fuzzy_pending.append(index)
+
+            # Tahap 2: fuzzy fallback untuk CV yang ditunda. Jalur paralel mengirim satu
+            # batch per shard supaya pembatalan dan pruning heap tetap berlaku antar batch
+            parallel_fuzzy = None
+            if fuzzy_pending and use_parallel_fuzzy:
+                parallel_executor = app.get_parallel_executor()
+                if parallel_executor is None or len(parallel_executor) != len(documents):
+                    use_parallel_fuzzy = False
+                else:
+                    parallel_fuzzy, current_fuzzy_time = perform_parallel_fuzzy_search(app, parallel_executor, keywords, fuzzy_pending)
+                    fuzzy_search_time += current_fuzzy_time
+                    if search_cancelled(app, generation):
+                        return
+            for index in fuzzy_pending:
+                if parallel_fuzzy is None and not top_k.can_enter(FUZZY_KEY_BOUND, index):
+                    # Heap sudah makin ketat oleh CV lain di shard ini
+                    continue
+                if parallel_fuzzy is not None:
+                    fuzzy_matches_dict, fuzzy_total, fuzzy_keywords_found = keyword_count_result(parallel_fuzzy.get(index, {}), keywords)
+                elif use_vocabulary:
+                    if vocabulary_fuzzy is None:
+                        vocabulary_fuzzy, current_fuzzy_time = perform_vocabulary_fuzzy_search(app, keywords)
+                        fuzzy_search_time += current_fuzzy_time
+                        if search_cancelled(app, generation):
+                            return
+                    fuzzy_matches_dict, fuzzy_total, fuzzy_keywords_found = vocabulary_fuzzy_result(vocabulary_fuzzy, keywords, documents[index].cv_id)
+                else:
+                    fuzzy_matches_dict, fuzzy_total, fuzzy_keywords_found, current_fuzzy_time = perform_fuzzy_search(app, documents[index].text, keywords, normalized=True)
                     fuzzy_search_time += current_fuzzy_time
-                    if fuzzy_total > 0:
-                        match_type = 'fuzzy'
-                        matches = fuzzy_matches_dict # Use fuzzy matches
-                        total_matches = fuzzy_total
-                        keywords_found_count = fuzzy_keywords_found
-                        keyword_coverage = fuzzy_keywords_found / len(keywords) if keywords else 0
-                        avg_frequency = fuzzy_total / fuzzy_keywords_found if fuzzy_keywords_found > 0 else 0
-                        similarity = keyword_coverage * 0.6 + min(1.0, avg_frequency / 3) * 0.4
-                
-                name = f"CV {cv_id}"
-                if db_record:
-                    first_name = db_record.get('first_name', '')
-                    last_name = db_record.get('last_name', '')
-                    if first_name or last_name:
-                        name = f"{first_name} {last_name}".strip()
-
-                all_results.append({
-                    'cv_data': {
-                        'cv_id': cv_id, 'name': name,
-                        'first_name': db_record.get('first_name', ''), 'last_name': db_record.get('last_name', ''),
-                        'address': db_record.get('address', ''), 'phone': db_record.get('phone_number', ''),
-                        'application_role': db_record.get('application_role', category),
-                        'cv_path': db_record.get('cv_path', f"data/cv/{category}/{cv_id}.pdf"),
-                        'category': category, 'resume_text': resume_text, 'resume_html': resume_html,
-                        'parsed_info': parsed_info,
-                        'emails': parsed_info.get('emails', []),
-                        'phones': parsed_info.get('phones', []),
-                        'skills': parsed_info.get('skills', []),
-                        'education': parsed_info.get('education', []),
-                        'experience': parsed_info.get('experience', []),
-                        'summary': parsed_info.get('summary', []),
-                        'names': parsed_info.get('names', [])
-                    },
-                    'matches': matches, 'match_count': total_matches, 'match_type': match_type,
-                    'similarity_score': similarity, 'keywords_found': keywords_found_count,
-                    'total_keywords': len(keywords),
-                    'keyword_coverage': (keywords_found_count / len(keywords) if keywords else 0)
-                })
+
+                match_type = 'no_match'
+                similarity = 0.0
+                matches, total_matches, keywords_found_count = {}, 0, 0
+                if fuzzy_total > 0:
+                    match_type = 'fuzzy'
+                    matches = fuzzy_matches_dict # Use fuzzy matches
+                    total_matches = fuzzy_total
+                    keywords_found_count = fuzzy_keywords_found
+                    similarity = fuzzy_similarity(fuzzy_total, fuzzy_keywords_found, keyword_total)
+
+                key = ranking_key(match_type, keywords_found_count, total_matches, similarity, keyword_total)
+                top_k.offer(key, index, (matches, total_matches, keywords_found_count, match_type, similarity))
+            if terminated:
+                break
+            now = time.time()
+            if now - last_render >= PARTIAL_RENDER_INTERVAL:
+                publish_partial_results(app, generation, top_k_results(store, top_k, keywords, records), processed, total_documents)
+                last_render = now
 
         # Process database-only records (those not in extracted_cvs but in db_cvs)
         # This logic might be redundant if all db_cvs are expected to have corresponding extracted_cvs.
         # For now, keeping it as per original structure.
-        processed_db_cv_ids = set(res['cv_data']['cv_id'] for res in all_results)
-
-        for cv_db_record in db_cvs:
-            cv_id = cv_db_record.get('cv_id') # Assuming cv_id is directly in db_cvs items
-            if not cv_id or cv_id in processed_db_cv_ids or cv_id in extracted_cv_ids:
-                continue # Skip if already processed or has an extracted version
-
-            # This block is for CVs in the database but NOT in the extracted_cvs.csv
-            # They likely won't have resume_text, resume_html, or category from extraction.
-            parsed_info = {}
-            searchable_text = ""
-            db_fields = [
-                cv_db_record.get('first_name', ''), cv_db_record.get('last_name', ''),
-                cv_db_record.get('address', ''), cv_db_record.get('phone_number', ''),
-                cv_db_record.get('application_role', ''), cv_db_record.get('date_of_birth', ''),
-                str(cv_db_record.get('applicant_id', '')), str(cv_db_record.get('detail_id', ''))
-            ]
-            db_text = ' '.join([str(field) for field in db_fields if field])
-            searchable_text += ' ' + db_text
-            # Category might be missing here if not in extracted_cvs
-            category_from_db = cv_db_record.get('category', '') # Or derive from cv_path if possible
-            if category_from_db:
-                 searchable_text += ' ' + category_from_db
-
-            matches, total_matches, keywords_found_count, current_exact_time = perform_exact_search(app, searchable_text, keywords, algorithm)
+        for db_index, document in enumerate(store.db_only_documents):
+            if search_cancelled(app, generation):
+                return
+            index = len(documents) + db_index
+            matches, total_matches, keywords_found_count, current_exact_time = perform_exact_search(app, document.text, keywords, algorithm, compiled_keywords, normalized=True)
             exact_search_time += current_exact_time
+            processed += 1
 
             match_type = 'no_match'
             similarity = 0.0
@@ -164,93 +308,72 @@ def handle_search_cv(app, e):
 
             if total_matches > 0:
                 match_type = 'exact'
-                keyword_coverage = keywords_found_count / len(keywords) if keywords else 0
-                avg_frequency = total_matches / keywords_found_count if keywords_found_count > 0 else 0
-                similarity = keyword_coverage * 0.7 + min(1.0, avg_frequency / 5) * 0.3
-            else: # Fallback to fuzzy search
-                fuzzy_matches_dict, fuzzy_total, fuzzy_keywords_found, current_fuzzy_time = perform_fuzzy_search(app, searchable_text, keywords)
+                similarity = exact_similarity(total_matches, keywords_found_count, keyword_total)
+            elif top_k.can_enter(FUZZY_KEY_BOUND, index): # Fallback to fuzzy search
+                fuzzy_matches_dict, fuzzy_total, fuzzy_keywords_found, current_fuzzy_time = perform_fuzzy_search(app, document.text, keywords, normalized=True)
                 fuzzy_search_time += current_fuzzy_time
                 if fuzzy_total > 0:
                     match_type = 'fuzzy'
                     matches = fuzzy_matches_dict
                     total_matches = fuzzy_total
                     keywords_found_count = fuzzy_keywords_found
-                    keyword_coverage = fuzzy_keywords_found / len(keywords) if keywords else 0
-                    avg_frequency = fuzzy_total / fuzzy_keywords_found if fuzzy_keywords_found > 0 else 0
-                    similarity = keyword_coverage * 0.6 + min(1.0, avg_frequency / 3) * 0.4
-            
-            name = f"CV {cv_id}"
-            first_name = cv_db_record.get('first_name', '')
-            last_name = cv_db_record.get('last_name', '')
-            if first_name or last_name:
-                name = f"{first_name} {last_name}".strip()
-
-            all_results.append({
-                'cv_data': {
-                    'cv_id': cv_id, 'name': name,
-                    'first_name': first_name, 'last_name': last_name,
-                    'address': cv_db_record.get('address', ''), 'phone': cv_db_record.get('phone_number', ''),
-                    'application_role': cv_db_record.get('application_role', category_from_db),
-                    'cv_path': cv_db_record.get('cv_path', f"data/cv/{category_from_db}/{cv_id}.pdf" if category_from_db else f"data/cv/UNKNOWN/{cv_id}.pdf"),
-                    'category': category_from_db,
-                    'resume_text': "", 'resume_html': "", # No extracted text for these
-                    'parsed_info': parsed_info, # Empty for these
-                    'emails': [], 'phones': [], 'skills': [], 'education': [], 'experience': [], 'summary': [], 'names': []
-                },
-                'matches': matches, 'match_count': total_matches, 'match_type': match_type,
-                'similarity_score': similarity, 'keywords_found': keywords_found_count,
-                'total_keywords': len(keywords),
-                'keyword_coverage': (keywords_found_count / len(keywords) if keywords else 0)
-            })
-
-        def sort_key(result):
-            coverage = result['keyword_coverage']
-            match_type_val = result['match_type']
-            match_count = result['match_count']
-            similarity_val = result['similarity_score']
-            match_type_score = 3 if match_type_val == 'exact' else 2 if match_type_val == 'fuzzy' else 0
-            return (coverage, match_type_score, match_count, similarity_val)
-
-        all_results.sort(key=sort_key, reverse=True)
-
-        if top_matches_filter == "all":
-            app.search_results = all_results
-        else:
-            app.search_results = all_results[:int(top_matches_filter)]
+                    similarity = fuzzy_similarity(fuzzy_total, fuzzy_keywords_found, keyword_total)
 
-        matching_count = len([r for r in app.search_results if r['match_count'] > 0])
-        app.current_pagination_page = 1
-        total_cvs_processed = len(all_results)
+            key = ranking_key(match_type, keywords_found_count, total_matches, similarity, keyword_total)
+            top_k.offer(key, index, (matches, total_matches, keywords_found_count, match_type, similarity))
 
-        app.update_summary_result_section(total_cvs_processed, exact_search_time, fuzzy_search_time, algorithm)
-        app.update_results_display()
-        app.show_snackbar(f"✅ Pencarian selesai! Ditemukan {matching_count} CV relevan dari {total_cvs_processed} total CV", ft.Colors.GREEN_600)
+        results = top_k_results(store, top_k, keywords, records)
+        with app.search_lock:
+            if search_cancelled(app, generation):
+                return
+            app.search_results = results
+            matching_count = len([r for r in app.search_results if r['match_count'] > 0])
+            total_cvs_processed = total_documents
+
+            app.update_summary_result_section(total_cvs_processed, exact_search_time, fuzzy_search_time, algorithm)
+            app.update_results_display()
+            app.show_snackbar(f"✅ Pencarian selesai! Ditemukan {matching_count} CV relevan dari {total_cvs_processed} total CV", ft.Colors.GREEN_600)
 
     except Exception as ex:
-        app.show_snackbar(f"❌ Error dalam pencarian: {str(ex)}", ft.Colors.RED_600)
+        if not search_cancelled(app, generation):
+            app.show_snackbar(f"❌ Error dalam pencarian: {str(ex)}", ft.Colors.RED_600)
         print(f"Search error: {ex}")
         print(f"Traceback: {traceback.format_exc()}")
     finally:
-        app.loading_indicator.visible = False
-        app.search_button.content.disabled = False
-        app.search_button.content.content = ft.Row([
-            ft.Text("🔍 Mulai Pencarian CV", color=ft.Colors.WHITE, size=18, weight=ft.FontWeight.BOLD)
-        ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
-        if hasattr(app, 'page') and app.page: # Ensure page exists
-            app.page.update()
-
-def perform_exact_search(app, text, keywords, algorithm):
+        # Hanya pencarian terbaru yang boleh mengembalikan tombol dan indikator loading
+        with app.search_lock:
+            if not search_cancelled(app, generation):
+                app.loading_indicator.visible = False
+                app.search_button.content.content = search_button_content(False)
+                if hasattr(app, 'page') and app.page: # Ensure page exists
+                    app.page.update()
+
+def compile_keywords(app, keywords, algorithm):
+    # Kompilasi tiap keyword sekali per query untuk KMP/BM, dipakai ulang di semua CV
+    keywords_lower = [normalize_query(k) for k in keywords]
+    if algorithm == "KMP":
+        return {kw: app.kmp_search.compile(kw) for kw in keywords_lower}
+    if algorithm == "BM":
+        return {kw: app.bm_search.compile(kw) for kw in keywords_lower}
+    return {}
+
+def perform_exact_search(app, text, keywords, algorithm, compiled_keywords=None, normalized=False):
+    # normalized=True berarti text sudah hasil normalisasi saat load dan dipakai apa adanya
     matches = {}
     total_matches = 0
     keywords_found_count = 0
-    text_lower = text.lower()
-    keywords_lower = [k.lower() for k in keywords]
+    text_lower = text if normalized else normalize_query(text)
+    keywords_lower = [normalize_query(k) for k in keywords]
     start_time = time.time()
+    if compiled_keywords is None:
+        compiled_keywords = compile_keywords(app, keywords, algorithm)
 
-    if algorithm == "AC" and len(keywords_lower) > 1:
-        all_found_matches = app.ac_search.search_multiple(text_lower, keywords_lower)
+    if algorithm in ("AC", "BM") and len(keywords_lower) > 1:
+        # Matcher multi-pattern diambil dari cache, jadi cukup dibangun sekali per query
+        engine = app.wm_search if algorithm == "BM" else app.ac_search
+        all_found_counts = engine.compile(keywords_lower).count(text_lower)
         for kw in keywords_lower:
-            count = len(all_found_matches.get(kw, []))
+            count = all_found_counts.get(kw, 0)
             if count > 0:
                 matches[kw] = count
                 total_matches += count
@@ -258,15 +381,10 @@ def perform_exact_search(app, text, keywords, algorithm):
     else:
         for kw in keywords_lower:
             count = 0
-            if algorithm == "KMP":
-                positions = app.kmp_search.search_all(text_lower, kw)
-                count = len(positions)
-            elif algorithm == "BM":
-                positions = app.bm_search.search_all(text_lower, kw)
-                count = len(positions)
+            if algorithm in ("KMP", "BM"):
+                count = compiled_keywords[kw].count(text_lower)
             elif algorithm == "AC": # Single keyword AC
-                positions = app.ac_search.search_single(text_lower, kw)
-                count = len(positions)
+                count = app.ac_search.count(text_lower, kw)
             else: # Default to string count if algorithm not specified or unknown
                 count = text_lower.count(kw)
             
@@ -278,24 +396,116 @@ def perform_exact_search(app, text, keywords, algorithm):
     elapsed_time_ms = (time.time() - start_time) * 1000
     return matches, total_matches, keywords_found_count, elapsed_time_ms
 
-def perform_fuzzy_search(app, text, keywords):
+def perform_corpus_exact_search(app, texts, keywords, algorithm="AC", corpus=None):
+    # Versi korpus dari perform_exact_search untuk engine multi-pattern: seluruh
+    # teks (sudah dinormalisasi) digabung menjadi satu buffer lalu dipindai sekali.
+    # corpus berisi (buffer, offsets) yang sudah dibangun saat load, kalau ada
+    keywords_lower = [normalize_query(k) for k in keywords]
+    start_time = time.time()
+    engine = app.wm_search if algorithm == "BM" else app.ac_search
+    if corpus is None:
+        corpus = build_corpus(texts)
+    corpus_counts = engine.compile(keywords_lower).scan_corpus(*corpus)
+    results = []
+    for doc_counts in corpus_counts:
+        matches = {}
+        total_matches = 0
+        keywords_found_count = 0
+        for kw in keywords_lower:
+            count = doc_counts.get(kw, 0)
+            if count > 0:
+                matches[kw] = count
+                total_matches += count
+                keywords_found_count += 1
+        results.append((matches, total_matches, keywords_found_count))
+    elapsed_time_ms = (time.time() - start_time) * 1000
+    return results, elapsed_time_ms
+
+def perform_indexed_exact_search(app, inverted_index, texts, keywords, algorithm, compiled_keywords=None):
+    # Versi inverted index dari perform_corpus_exact_search, hasilnya sama per dokumen.
+    # Waktu sebanding jumlah hasil, bukan ukuran korpus
+    keywords_lower = [normalize_query(k) for k in keywords]
+    start_time = time.time()
+    if compiled_keywords is None:
+        compiled_keywords = compile_keywords(app, keywords, algorithm)
+
+    def verify(doc_no, kw):
+        if algorithm in ("KMP", "BM"):
+            return compiled_keywords[kw].count(texts[doc_no])
+        return app.ac_search.count(texts[doc_no], kw)
+
+    keyword_counts = {kw: inverted_index.count(kw, verify) for kw in dict.fromkeys(keywords_lower)}
+    results = [({}, 0, 0) for _ in texts]
+    for doc_no in set().union(*keyword_counts.values()):
+        matches = {}
+        total_matches = 0
+        keywords_found_count = 0
+        for kw in keywords_lower:
+            count = keyword_counts[kw].get(doc_no, 0)
+            if count > 0:
+                matches[kw] = count
+                total_matches += count
+                keywords_found_count += 1
+        results[doc_no] = (matches, total_matches, keywords_found_count)
+    elapsed_time_ms = (time.time() - start_time) * 1000
+    return results, elapsed_time_ms
+
+def keyword_count_result(counts, keywords):
+    # (matches, total, jumlah keyword ditemukan) dari hitungan per keyword satu dokumen
+    matches = {}
+    total_matches = 0
+    keywords_found_count = 0
+    for kw in (normalize_query(k) for k in keywords):
+        count = counts.get(kw, 0)
+        if count > 0:
+            matches[kw] = count
+            total_matches += count
+            keywords_found_count += 1
+    return matches, total_matches, keywords_found_count
+
+def perform_parallel_exact_search(app, executor, keywords, algorithm):
+    # Versi multi-proses dari perform_exact_search untuk semua dokumen sekaligus
+    keywords_lower = [normalize_query(k) for k in keywords]
+    start_time = time.time()
+    results = [keyword_count_result(counts, keywords_lower) for counts in executor.exact_counts(keywords_lower, algorithm)]
+    elapsed_time_ms = (time.time() - start_time) * 1000
+    return results, elapsed_time_ms
+
+def perform_parallel_fuzzy_search(app, executor, keywords, doc_nos):
+    # Versi multi-proses dari perform_fuzzy_search, hanya untuk dokumen di doc_nos
+    keywords_lower = [normalize_query(k) for k in keywords]
+    start_time = time.time()
+    fuzzy_engine = getattr(app, 'fuzzy_engine', 'levenshtein')
+    results = executor.fuzzy_counts(keywords_lower, fuzzy_engine, FUZZY_SIMILARITY_THRESHOLD, doc_nos) if doc_nos else {}
+    elapsed_time_ms = (time.time() - start_time) * 1000
+    return results, elapsed_time_ms
+
+def perform_fuzzy_search(app, text, keywords, normalized=False):
     fuzzy_matches_dict = {}
     fuzzy_total = 0
     fuzzy_keywords_found = 0
-    text_lower = text.lower()
-    keywords_lower = [k.lower() for k in keywords]
+    text_lower = text if normalized else normalize_query(text)
+    keywords_lower = [normalize_query(k) for k in keywords]
     start_time = time.time()
 
+    fuzzy_engine = getattr(app, 'fuzzy_engine', 'levenshtein')
     for kw in keywords_lower:
         keyword_fuzzy_count = 0
-        # Split text into unique words for Levenshtein to avoid overcounting on repeated words in text
-        unique_words_in_text = set(text_lower.split())
-        for word in unique_words_in_text:
-            if len(word) > 2: # Avoid matching very short words
-                sim = app.levenshtein.similarity(kw, word)
-                if sim >= 0.7: # Similarity threshold
-                    keyword_fuzzy_count += 1 # Count how many words in text are similar to this keyword
-        
+        if fuzzy_engine == "bitap":
+            # Bitap k-error: satu kali pemindaian teks utuh, k diturunkan dari threshold similarity
+            max_errors = max_distance_for_similarity(len(kw), FUZZY_SIMILARITY_THRESHOLD)
+            if max_errors > 0:
+                keyword_fuzzy_count = app.bitap_search.count_approximate(text_lower, kw, max_errors)
+        else:
+            # Split text into unique words for Levenshtein to avoid overcounting on repeated words in text
+            unique_words_in_text = set(text_lower.split())
+            compiled_kw = app.levenshtein.compile(kw)
+            for word in unique_words_in_text:
+                if len(word) > 2: # Avoid matching very short words
+                    sim = compiled_kw.similarity(word, FUZZY_SIMILARITY_THRESHOLD)
+                    if sim >= FUZZY_SIMILARITY_THRESHOLD: # Similarity threshold
+                        keyword_fuzzy_count += 1 # Count how many words in text are similar to this keyword
+
         if keyword_fuzzy_count > 0:
             fuzzy_matches_dict[kw] = keyword_fuzzy_count
             fuzzy_total += keyword_fuzzy_count # Sum of all similar word counts for this keyword
@@ -304,6 +514,29 @@ def perform_fuzzy_search(app, text, keywords):
     elapsed_time_ms = (time.time() - start_time) * 1000
     return fuzzy_matches_dict, fuzzy_total, fuzzy_keywords_found, elapsed_time_ms
 
+def perform_vocabulary_fuzzy_search(app, keywords):
+    # Satu lookup per keyword di kosakata korpus (engine sesuai app.fuzzy_engine), lalu gabungkan
+    # postings: hasilnya jumlah kata mirip keyword per cv_id, sama dengan perform_fuzzy_search per kata
+    start_time = time.time()
+    keyword_counts = {}
+    for kw in dict.fromkeys(normalize_query(k) for k in keywords):
+        keyword_counts[kw] = app.vocabulary.fuzzy_document_counts(kw, FUZZY_SIMILARITY_THRESHOLD, app.fuzzy_engine)
+    elapsed_time_ms = (time.time() - start_time) * 1000
+    return keyword_counts, elapsed_time_ms
+
+def vocabulary_fuzzy_result(keyword_counts, keywords, cv_id):
+    # Ambil hasil fuzzy satu CV dari hasil perform_vocabulary_fuzzy_search
+    fuzzy_matches_dict = {}
+    fuzzy_total = 0
+    fuzzy_keywords_found = 0
+    for kw in (normalize_query(k) for k in keywords):
+        keyword_fuzzy_count = keyword_counts[kw].get(cv_id, 0)
+        if keyword_fuzzy_count > 0:
+            fuzzy_matches_dict[kw] = keyword_fuzzy_count
+            fuzzy_total += keyword_fuzzy_count
+            fuzzy_keywords_found += 1
+    return fuzzy_matches_dict, fuzzy_total, fuzzy_keywords_found
+
 def handle_button_hover(app, e):
     if e.data == "true":
         e.control.shadow = ft.BoxShadow(
@@ -378,10 +611,8 @@ def handle_go_to_page(app, page_num):
 
 def handle_show_summary(app, cv_data):
     from .components import create_summary_page_component
-    # Prepare parsed info
-    parsed_info = cv_data.get('parsed_info', {})
-    if not parsed_info and cv_data.get('resume_text'):
-        parsed_info = app.regex_extractor.extract_cv_info(cv_data['resume_text'])
+    # Prepare parsed info (regex hanya dijalankan kalau belum ada di cache)
+    parsed_info = app.get_parsed_cv_info(cv_data)
     # Build full summary page container
     summary_container = create_summary_page_component(app, cv_data, parsed_info)
     # Show summary view, hide home view
@@ -2,6 +2,23 @@ import os
 import flet as ft
 import math
 import csv
+from src.algorithms.vocabulary import VocabularyIndex
+from src.algorithms.parallel_search import ParallelSearchExecutor
+from .document_store import DocumentStore
+
+# Lokasi index SymSpell yang disimpan di disk dan opsinya
+SYMSPELL_INDEX_PATH = "data/symspell_index.bin"
+SYMSPELL_OPTIONS = {'max_distance': 3, 'prefix_length': 7, 'max_entries': 4000000}
+
+# Pencarian exact lewat inverted index; False berarti setiap query memindai teks dengan engine yang dipilih
+USE_INVERTED_INDEX = True
+
+# Lokasi cache hasil parsing regex info CV
+CV_INFO_CACHE_PATH = "data/cv_info_cache.json"
+
+# Jumlah proses worker fuzzy search paralel, di bawah 2 berarti pencarian tetap serial.
+# Pool baru dibuat saat pertama kali dipakai (fuzzy engine bitap/levenshtein)
+PARALLEL_SEARCH_WORKERS = os.cpu_count() or 1
 
 
 def load_seed_data_util(app):
@@ -23,7 +40,8 @@ def load_seed_data_util(app):
 def load_extracted_cv_data_util(app):
     """
     Load extracted CV data from CSV into memory for searching.
-    Sets app.extracted_cvs as a list of dicts with keys: cv_id, resume_str, resume_html, category.
+    Sets app.extracted_cvs as a list of dicts with keys: cv_id, resume_str, resume_html, category,
+    then builds app.document_store from it.
     """
     csv_path = "data/extracted_cvs.csv"
     app.extracted_cvs = []
@@ -44,7 +62,67 @@ def load_extracted_cv_data_util(app):
     else:
         print(f"⚠️ No extracted CV CSV found at {csv_path}. Run cv2csv to generate it.")
         app.extracted_cvs = []
- 
+    build_document_store_util(app)
+
+def build_document_store_util(app):
+    """
+    Bangun document store sekali saat load: teks pencarian setiap CV
+    (resume + field database + kategori) dinormalisasi lengkap dengan peta
+    offset, plus inverted index (atau buffer korpus kalau index dimatikan).
+    Dipanggil lewat load_extracted_cv_data_util setiap data CSV dimuat.
+    """
+    try:
+        db_cvs = app.load_cvs_from_db()
+    except Exception as e:
+        print(f"❌ Error loading database records for document store: {e}")
+        db_cvs = []
+    app.document_store = DocumentStore(app.db.get_cv_id_from_path, USE_INVERTED_INDEX).refresh(getattr(app, 'extracted_cvs', []), db_cvs)
+    # Executor lama memegang isi store sebelumnya; yang baru dibuat saat dibutuhkan
+    executor = getattr(app, 'parallel_executor', None)
+    if executor is not None:
+        executor.close()
+    app.parallel_executor = None
+
+def get_parallel_executor_util(app):
+    """
+    Executor pencarian paralel (exact tanpa inverted index, fuzzy per dokumen)
+    untuk isi document store saat ini, dibuat saat pertama kali dibutuhkan:
+    korpus disalin ke shared memory dan pool worker dibuat sekali, bukan per
+    query. None kalau worker kurang dari 2,
+    store kosong, atau pool gagal dibuat.
+    """
+    executor = getattr(app, 'parallel_executor', None)
+    if executor is not None or PARALLEL_SEARCH_WORKERS < 2 or not app.document_store.documents:
+        return executor
+    try:
+        app.parallel_executor = ParallelSearchExecutor(app.document_store.texts, PARALLEL_SEARCH_WORKERS)
+        print(f"✅ Started parallel search pool: {PARALLEL_SEARCH_WORKERS} workers")
+    except Exception as e:
+        print(f"❌ Error starting parallel search pool: {e}")
+    return app.parallel_executor
+
+def load_vocabulary_index_util(app):
+    """
+    Bangun kosakata korpus (token -> postings cv_id) sekali saat startup
+    dari teks yang sudah dinormalisasi, dipakai fuzzy fallback lewat
+    BK-tree atau SymSpell.
+    """
+    app.vocabulary = VocabularyIndex(symspell_options=SYMSPELL_OPTIONS, symspell_path=SYMSPELL_INDEX_PATH)
+    try:
+        for document in app.document_store.documents:
+            app.vocabulary.add_document(document.cv_id, document.text)
+        print(f"✅ Built vocabulary index: {len(app.vocabulary)} unique words")
+    except Exception as e:
+        print(f"❌ Error building vocabulary index: {e}")
+
+def get_parsed_cv_info_util(app, cv_data):
+    # Info CV (email, skill, pendidikan, ...) dari cache, diparse sekali per cv_id dan isi resume
+    parsed_info = cv_data.get('parsed_info')
+    if parsed_info is None:
+        parsed_info = app.cv_info_cache.get(cv_data.get('cv_id', ''), cv_data.get('resume_text', ''))
+        cv_data['parsed_info'] = parsed_info
+    return parsed_info
+
 def load_cvs_from_db_util(app):
     return app.db.get_all_applications() # This likely fetches from ApplicantProfile & ApplicationDetail
 
@@ -1,4 +1,5 @@
 from .pdf_extractor import PDFExtractor
 from .regex_extractor import RegexExtractor
+from .cv_info_cache import CVInfoCache
 
-__all__ = ['PDFExtractor', 'RegexExtractor']
\ No newline at end of file
+__all__ = ['PDFExtractor', 'RegexExtractor', 'CVInfoCache']
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import copy
+import json
+import atexit
+import hashlib
+from typing import Dict, Optional
+
+from .regex_extractor import RegexExtractor
+
+# Versi format file cache, dinaikkan kalau isi extract_cv_info berubah
+CACHE_FORMAT_VERSION = 1
+
+# Jumlah entri baru yang dikumpulkan sebelum file cache ditulis ulang
+FLUSH_EVERY = 50
+
+class CVInfoCache:
+    """
+    Cache hasil RegexExtractor.extract_cv_info per CV. Kunci cache adalah
+    cv_id plus hash isi resume, jadi resume yang berubah otomatis diparse
+    ulang. Parsing hanya terjadi saat info CV benar-benar dibutuhkan
+    (summary dibuka), bukan di setiap pencarian.
+
+    Kalau path diberikan, cache dimuat dari file JSON saat dibuat. Entri
+    baru dikumpulkan dan file ditulis ulang setiap FLUSH_EVERY entri, saat
+    flush() dipanggil (misalnya saat refresh data) dan saat proses keluar,
+    bukan setiap kali satu CV dibuka.
+
+    get() mengembalikan salinan, jadi pemanggil bebas mengubah hasilnya
+    tanpa mengubah isi cache.
+    """
+    def __init__(self, extractor: Optional[RegexExtractor] = None, path: Optional[str] = None):
+        self.extractor = extractor or RegexExtractor()
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.pending = 0
+        if path:
+            self.load()
+            atexit.register(self.flush)
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def _key(self, cv_id: str, text: str) -> str:
+        return f"{cv_id}:{self.content_hash(text)}"
+
+    def get(self, cv_id: str, text: str) -> Dict:
+        # Info CV dari cache, diparse dengan regex hanya kalau belum ada
+        if not text:
+            return {}
+        key = self._key(cv_id, text)
+        info = self.entries.get(key)
+        if info is None:
+            info = self.extractor.extract_cv_info(text)
+            self.entries[key] = info
+            self.pending += 1
+            if self.pending >= FLUSH_EVERY:
+                self.flush()
+        return copy.deepcopy(info)
+
+    def flush(self) -> None:
+        # Tulis entri yang belum tersimpan ke file, tidak melakukan apa-apa kalau tidak ada
+        if self.path and self.pending:
+            self.save()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load CV info cache: {e}")
+            return
+        if state.get('version') == CACHE_FORMAT_VERSION:
+            self.entries = state.get('entries', {})
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_FORMAT_VERSION, 'entries': self.entries}, f)
+            os.replace(temp_path, self.path)
+            self.pending = 0
+        except OSError as e:
+            print(f"⚠️ Could not save CV info cache: {e}")
+
+    def __len__(self) -> int:
+        return len(self.entries)